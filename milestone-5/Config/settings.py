@@ -23,9 +23,26 @@ class Settings(BaseSettings):
     # ChromaDB
     CHROMA_PERSIST_DIR: str = None
     
+    # Vector store backend ("chroma" or "numpy")
+    VECTOR_BACKEND: str = "chroma"
+    NUMPY_IVF_THRESHOLD: int = 50000
+    NUMPY_IVF_NPROBE: int = 8
+    NUMPY_QUANTIZATION: str = "none"
+    NUMPY_RESCORE_OVERSAMPLE: int = 4
+    
     # Embeddings
     EMBED_MODEL: str = None
     
+    # Document embedding engine (indexing)
+    EMBED_PROCESSES: int = 0  # 0 = embed in-process
+    EMBED_BATCH_SIZE: int = 32
+    EMBED_THREADS_PER_PROCESS: int = 1
+    EMBED_SORT_BY_LENGTH: bool = True
+    
+    # Persistent chunk embedding cache (indexing)
+    EMBEDDING_CACHE_PATH: str = "milestone-5/cache/embedding_cache.sqlite3"
+    EMBEDDING_CACHE_MAX_MB: int = 1024  # 0 = disabled
+    
     # LLM (Ollama)
     LLM_MODEL: str = None
     LLM_TEMPERATURE: float = None
@@ -34,10 +51,50 @@ class Settings(BaseSettings):
     CHUNK_SIZE: int = None
     CHUNK_OVERLAP: int = None
     TOP_K: int = None
+    INDEX_BATCH_SIZE: int = 64
+    INDEX_LOCK_HOLD_SECONDS: float = 5  # bulk indexing writes its batch and yields the write lock after this long
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = 0.85  # Jaccard similarity of word 3-shingles (MinHash estimate)
+    PDF_PARSE_WORKERS: int = None  # None = one per CPU
+    PDF_PARALLEL_MIN_PAGES: int = 64
+    INDEX_WORKERS: int = 1
+    INDEX_JOB_POLL_SECONDS: float = 2
+    INDEX_JOB_HEARTBEAT_SECONDS: float = 15  # how often a worker renews the lease on its running job
+    INDEX_JOB_LEASE_SECONDS: float = 60  # a running job without a heartbeat for this long is reclaimed
+    INDEX_RELOAD_CHECK_SECONDS: float = 1  # how often each worker checks for a new generation or writes
+    INDEX_GENERATIONS_KEEP: int = 2  # generations kept after a rebuild, including the active one
+    RETRIEVAL_MODE: str = "vector"
+    HYBRID_RRF_K: int = 60
+    HYBRID_CANDIDATE_MULTIPLIER: int = 4
+    
+    # Query embedding cache
+    QUERY_CACHE_SIZE: int = 1024
+    QUERY_CACHE_TTL_SECONDS: float = 3600
+    
+    # Semantic answer cache (/ask)
+    ANSWER_CACHE_SIZE: int = 512
+    ANSWER_CACHE_TTL_SECONDS: float = 600
+    ANSWER_CACHE_THRESHOLD: float = 0.95
+    
+    # Async request pipeline (executor threads for blocking work)
+    EMBEDDING_WORKERS: int = 2
+    VECTOR_STORE_WORKERS: int = 4
+    DB_WORKERS: int = 16
     
     # Chat
     MAX_HISTORY_MESSAGES: int = None
     SUMMARIZE_AFTER: int = None
+    SUMMARY_BLOCK_SIZE: int = 10  # messages summarized per LLM call beyond MAX_HISTORY_MESSAGES
+    SUMMARY_WORKERS: int = 1
+    SUMMARY_MAX_ATTEMPTS: int = 3
+    SUMMARY_RETRY_SECONDS: float = 5  # doubled after each failed attempt
+    SUMMARY_FANOUT: int = 4  # summaries rolled up into one at the next level
+    SUMMARY_TOKEN_BUDGET: int = 600  # approximate tokens of summaries in the chat context
+    MEMORY_ENABLED: bool = True  # embed summarized messages and recall relevant ones per turn
+    MEMORY_TOP_K: int = 3
+    MEMORY_MIN_SIMILARITY: float = 0.6  # cosine similarity to the user's message
+    MEMORY_INDEX_DIR: str = "milestone-5/storage/memory"  # one recall index per session
+    MEMORY_IVF_THRESHOLD: int = 2000  # summarized messages at which a session's recall index uses IVF
     
     class Config:
         env_file = ".env"
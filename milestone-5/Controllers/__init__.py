@@ -6,3 +6,4 @@ from Controllers.ask_controller import AskController
 from Controllers.chat_controller import ChatController
 from Controllers.user_controller import UserController
 from Controllers.history_controller import HistoryController
+from Controllers.stats_controller import StatsController
@@ -1,31 +1,114 @@
+from typing import AsyncIterator
 from Services.retrieval_service import RetrievalService
+from Services.answer_cache import CachedAnswer
 from Services.llm_service import LLMService
+from Services.model_registry import ModelRegistry
 from Schemas.api_schemas import AskResponse
+from Config import settings
+from Utils.sse import format_sse
 
 
 class AskController:
     """Controller for RAG question-answering."""
     
-    def __init__(self , model_name: str = "gemma3:1b" , embed_model: str = "BAAI/bge-base-en-v1.5"):
-        self.retrieval_service = RetrievalService(embed_model=embed_model)
-        self.llm_service = LLMService(model_name=model_name)
+    def __init__(self , registry: ModelRegistry , model_name: str = "gemma3:1b" , embed_model: str = "BAAI/bge-base-en-v1.5"):
+        self.registry = registry
+        self.retrieval_service = RetrievalService(self.registry, embed_model=embed_model)
+        self.llm_service = LLMService(self.registry, model_name=model_name)
     
-    def ask(self, query: str, top_k: int = 3) -> AskResponse:
-        """Retrieve relevant docs and generate answer."""
+    async def aask(self, query: str, top_k: int = 3, use_cache: bool = True) -> AskResponse:
+        """Retrieve relevant docs and generate answer without blocking the event loop.
         
-        # 1. Retrieve relevant chunks from ChromaDB
-        results = self.retrieval_service.search(query, top_k)
+        A semantically similar question answered against the same index
+        generation is served from the answer cache unless use_cache is False;
+        a bypassed request still refreshes the cache with its new answer.
+        """
         
-        # 2. Extract content and sources
-        context = [r["content"] for r in results]
-        sources = [r["source"] for r in results]
+        # 1. Embed the query and check the semantic answer cache
+        embedding, generation, cached = await self._acheck_cache(query, top_k, use_cache)
+        if cached:
+            return AskResponse(
+                query=query,
+                answer=cached.answer,
+                sources=cached.sources,
+                cached=True
+            )
         
-        # 3. Generate answer using LLM with context
-        answer = self.llm_service.generate(query=query, context=context)
+        # 2. Retrieve relevant chunks (query embedded once)
+        retrieval = await self.retrieval_service.aretrieve(
+            query, top_k, embedding=embedding, mode=settings.RETRIEVAL_MODE
+        )
+        
+        # 3. Generate answer with the async Ollama client
+        answer = await self.llm_service.agenerate(query=query, context=retrieval.contents)
+        
+        # 4. Cache the answer for similar questions
+        self.registry.answer_cache.add(
+            embedding, top_k, generation, retrieval.chunk_ids, answer, retrieval.sources
+        )
         
         return AskResponse(
             query=query,
             answer=answer,
-            sources=list(set(sources))  
-            
-        )
\ No newline at end of file
+            sources=retrieval.sources
+        )
+    
+    async def aask_stream(self, query: str, top_k: int = 3, use_cache: bool = True) -> AsyncIterator[str]:
+        """Retrieve relevant docs and stream the generated answer as Server-Sent Events without blocking.
+        
+        Sources are sent first, then answer tokens, then a "done" event.
+        A cache hit is sent as a single token.
+        """
+        
+        # 1. Embed the query and check the semantic answer cache
+        embedding, generation, cached = await self._acheck_cache(query, top_k, use_cache)
+        if cached:
+            yield format_sse("sources", {"sources": cached.sources, "cached": True})
+            yield format_sse("token", {"content": cached.answer})
+            yield format_sse("done", {"answer": cached.answer})
+            return
+        
+        # 2. Retrieve relevant chunks and send sources up front
+        retrieval = await self.retrieval_service.aretrieve(
+            query, top_k, embedding=embedding, mode=settings.RETRIEVAL_MODE
+        )
+        yield format_sse("sources", {"sources": retrieval.sources, "cached": False})
+        
+        # 3. Stream the answer as the LLM produces it
+        tokens = []
+        async for token in self.llm_service.astream(query=query, context=retrieval.contents):
+            tokens.append(token)
+            yield format_sse("token", {"content": token})
+        answer = "".join(tokens)
+        
+        # 4. Cache the complete answer for similar questions
+        self.registry.answer_cache.add(
+            embedding, top_k, generation, retrieval.chunk_ids, answer, retrieval.sources
+        )
+        yield format_sse("done", {"answer": answer})
+    
+    async def _acheck_cache(self, query: str, top_k: int,
+                            use_cache: bool) -> tuple[list[float], int, CachedAnswer | None]:
+        """Embed the query and look it up in the semantic answer cache.
+        
+        The active index is rechecked first, so an answer cached before a
+        generation swap or another process's write stops being served within
+        INDEX_RELOAD_CHECK_SECONDS.
+        
+        Args:
+            query: User's question.
+            top_k: Number of chunks the answer is generated from.
+            use_cache: False to skip the lookup.
+        
+        Returns:
+            The query embedding, the index generation to cache the answer
+            under, and the cached answer (None on a miss or bypass).
+        """
+        embedding = await self.retrieval_service.aembed_query(query)
+        # Follow generation swaps and other processes' writes before trusting the cache
+        await self.registry.run_in(
+            self.registry.store_executor, self.registry.get_index_dir, self.retrieval_service.storage_dir
+        )
+        generation = self.registry.index_generation
+        cached = self.registry.answer_cache.lookup(embedding, top_k, generation) if use_cache else None
+        return embedding, generation, cached
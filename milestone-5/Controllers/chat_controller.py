@@ -3,10 +3,14 @@
 This module handles chat with history and RAG.
 """
 
+from typing import AsyncIterator
 from sqlalchemy.orm import Session
 from Services.chat_service import ChatService
+from Services.model_registry import ModelRegistry
+from Services.summary_worker import SummaryWorker
 from Repositories import SessionRepository, UserRepository
 from Schemas.api_schemas import ChatResponse
+from Utils.sse import format_sse
 
 
 class ChatController:
@@ -17,21 +21,25 @@ class ChatController:
         chat_service: Service for chat operations.
         session_repo: Repository for session operations.
         user_repo: Repository for user operations.
+        registry: Shared model registry (owns the DB executor).
     """
     
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, registry: ModelRegistry, summary_worker: SummaryWorker = None) -> None:
         """Initialize the chat controller.
         
         Args:
             db: SQLAlchemy database session.
+            registry: Shared model registry.
+            summary_worker: Background summary worker.
         """
         self.db = db
-        self.chat_service = ChatService(db)
+        self.chat_service = ChatService(db, registry, summary_worker)
+        self.registry = self.chat_service.registry
         self.session_repo = SessionRepository(db)
         self.user_repo = UserRepository(db)
     
-    def chat(self, user_id: str, session_id: str, message: str) -> ChatResponse:
-        """Process a chat message.
+    async def achat(self, user_id: str, session_id: str, message: str) -> ChatResponse:
+        """Process a chat message without blocking the event loop.
         
         Args:
             user_id: The user's UUID.
@@ -43,14 +51,36 @@ class ChatController:
         """
         # Create session if not exists
         if not session_id:
-            session = self.session_repo.create(user_id, title=message[:50])
-            session_id = session.session_id
+            session_id = await self.registry.run_in(self.registry.db_executor, self._create_session, user_id, message)
         
         # Process chat
-        result = self.chat_service.chat(session_id, message)
+        result = await self.chat_service.achat(session_id, message)
         
         return ChatResponse(
             session_id=session_id,
             answer=result["answer"],
             sources=result["sources"]
         )
+    
+    async def achat_stream(self, user_id: str, session_id: str, message: str) -> AsyncIterator[str]:
+        """Process a chat message as a Server-Sent Events stream without blocking.
+        
+        Args:
+            user_id: The user's UUID.
+            session_id: The session's UUID (optional, creates new if None).
+            message: The user's message.
+            
+        Yields:
+            SSE-formatted "sources", "token" and "done" events.
+        """
+        # Create session if not exists
+        if not session_id:
+            session_id = await self.registry.run_in(self.registry.db_executor, self._create_session, user_id, message)
+        
+        async for event, data in self.chat_service.achat_stream(session_id, message):
+            yield format_sse(event, data)
+    
+    def _create_session(self, user_id: str, message: str) -> str:
+        """Create a session titled after the first message and return its ID."""
+        session = self.session_repo.create(user_id, title=message[:50])
+        return session.session_id
@@ -1,27 +1,76 @@
+from datetime import datetime
+from typing import BinaryIO
+from sqlalchemy.orm import Session
 from Services.index_service import IndexService
-from Schemas.api_schemas import IndexResponse
+from Services.index_job_service import IndexJobService
+from Services.index_worker import IndexWorker
+from Services.model_registry import ModelRegistry
+from Models.index_job_model import IndexJob
+from Schemas.api_schemas import IndexResponse, IndexJobResponse
 
 
 class IndexController:
     """Controller for indexing operations."""
     
-    def __init__(self):
-        self.service = IndexService()
+    def __init__(self, registry: ModelRegistry, db: Session = None, worker: IndexWorker = None):
+        self.registry = registry
+        self.job_service = IndexJobService(db) if db is not None else None
+        self.worker = worker
+        self._service = None
     
-    def index_text(self, content: str, source: str) -> IndexResponse:
-        """Handle raw text indexing."""
-        chunks = self.service.index_text(content, source)
+    @property
+    def service(self) -> IndexService:
+        """Index service, created on first use since it loads the embedding engine."""
+        if self._service is None:
+            self._service = IndexService(self.registry)
+        return self._service
+    
+    def delete_source(self, source: str) -> IndexResponse | None:
+        """Handle document deletion; returns None if the source is not indexed."""
+        removed = self.service.delete_source(source)
+        if not removed:
+            return None
         return IndexResponse(
             success=True,
-            message=f"Indexed {source}",
-            chunks_indexed=chunks
+            message=f"Deleted {source}",
+            chunks_indexed=0,
+            chunks_removed=removed
         )
     
-    def index_file(self, file_bytes: bytes, filename: str) -> IndexResponse:
-        """Handle file upload indexing."""
-        chunks = self.service.index_file(file_bytes, filename)
-        return IndexResponse(
-            success=True,
-            message=f"Indexed {filename}",
-            chunks_indexed=chunks
-        )
\ No newline at end of file
+    def submit_file(self, file: BinaryIO, filename: str, source: str = None) -> IndexJobResponse:
+        """Queue a file upload for background indexing."""
+        job = self.job_service.submit_file(file, filename, source)
+        self.worker.notify()
+        return self._to_job_response(job)
+    
+    def submit_text(self, content: str, source: str) -> IndexJobResponse:
+        """Queue raw text for background indexing."""
+        job = self.job_service.submit_text(content, source)
+        self.worker.notify()
+        return self._to_job_response(job)
+    
+    def get_job(self, job_id: str) -> IndexJobResponse | None:
+        """Get the state and progress of an index job; returns None if not found."""
+        job = self.job_service.get_job(job_id)
+        return self._to_job_response(job) if job else None
+    
+    def _to_job_response(self, job: IndexJob) -> IndexJobResponse:
+        """Convert an IndexJob to a response with its throughput."""
+        chunks_per_second = None
+        if job.started_at:
+            elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+            chunks_per_second = job.chunks_processed / elapsed if elapsed > 0 else None
+        return IndexJobResponse(
+            job_id=job.job_id,
+            source=job.source,
+            status=job.status,
+            chunks_processed=job.chunks_processed or 0,
+            chunks_embedded=job.chunks_embedded or 0,
+            chunks_deduplicated=job.chunks_deduplicated or 0,
+            chunks_removed=job.chunks_removed or 0,
+            chunks_per_second=chunks_per_second,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at
+        )
@@ -1,17 +1,22 @@
 from Services.retrieval_service import RetrievalService
-from Schemas.api_schemas import SearchResponse, SearchResult
+from Services.model_registry import ModelRegistry
+from Models.retrieval_context import RetrievalContext
+from Schemas.api_schemas import SearchRequest, SearchResponse, SearchResult, BatchSearchResponse
 
 
 class RetrievalController:
     """Controller for search operations."""
     
-    def __init__(self):
-        self.service = RetrievalService()
+    def __init__(self, registry: ModelRegistry):
+        self.service = RetrievalService(registry)
     
-    def search(self, query: str, top_k: int = 5) -> SearchResponse:
-        """Handle search request."""
-        results = self.service.search(query, top_k)
-        
+    async def asearch(self, query: str, top_k: int = 5, mode: str = "vector") -> SearchResponse:
+        """Handle search request without blocking the event loop."""
+        results = await self.service.asearch(query, top_k, mode)
+        return self._to_response(query, results)
+    
+    def _to_response(self, query: str, results: list[dict]) -> SearchResponse:
+        """Convert raw search results to a SearchResponse."""
         search_results = []
         for r in results:
             search_results.append(SearchResult(
@@ -20,4 +25,27 @@ class RetrievalController:
                 score=r["score"]
             ))
         
-        return SearchResponse(query=query, results=search_results)
\ No newline at end of file
+        return SearchResponse(query=query, results=search_results)
+    
+    async def asearch_batch(self, requests: list[SearchRequest]) -> BatchSearchResponse:
+        """Handle batched search request without blocking the event loop, preserving query order."""
+        contexts = await self.service.aretrieve_batch(
+            [r.query for r in requests],
+            [r.top_k for r in requests],
+            [r.mode for r in requests]
+        )
+        return self._to_batch_response(contexts)
+    
+    def _to_batch_response(self, contexts: list[RetrievalContext]) -> BatchSearchResponse:
+        """Convert retrieval contexts to a BatchSearchResponse."""
+        responses = []
+        for ctx in contexts:
+            responses.append(SearchResponse(
+                query=ctx.query,
+                results=[
+                    SearchResult(content=r["content"], source=r["source"], score=r["score"])
+                    for r in ctx.results
+                ]
+            ))
+        
+        return BatchSearchResponse(results=responses)
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""Controller for runtime statistics.
+
+This module reports statistics of the shared in-process caches.
+"""
+
+from Services.model_registry import ModelRegistry
+from Schemas.api_schemas import StatsResponse
+
+
+class StatsController:
+    """Controller for statistics operations.
+    
+    Attributes:
+        registry: Shared model registry.
+    """
+    
+    def __init__(self, registry: ModelRegistry) -> None:
+        """Initialize the stats controller.
+        
+        Args:
+            registry: Shared model registry.
+        """
+        self.registry = registry
+    
+    def get_stats(self) -> StatsResponse:
+        """Get statistics for the shared caches.
+        
+        Returns:
+            StatsResponse with per-cache statistics.
+        """
+        return StatsResponse(**self.registry.stats())
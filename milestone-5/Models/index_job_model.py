@@ -0,0 +1,48 @@
+"""Index job model for background document indexing.
+
+This module defines the IndexJob ORM model for the indexing job queue.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime
+from Database import Base
+from Utils import generate_uuid
+
+
+class IndexJob(Base):
+    """IndexJob model representing one queued document indexing request.
+    
+    Attributes:
+        job_id: Unique identifier for the job (UUID).
+        source: Source name the document is indexed under.
+        filename: Original filename (selects the loader).
+        upload_path: Spooled copy of the upload on disk.
+        status: "queued", "running", "completed" or "failed".
+        chunks_processed: Chunks of the document processed so far.
+        chunks_embedded: New or changed chunks embedded.
+        chunks_deduplicated: New chunks linked to a stored near-duplicate.
+        chunks_removed: Stale chunks removed.
+        error: Error message if the job failed.
+        created_at: Timestamp when the job was submitted.
+        started_at: Timestamp when a worker picked the job up.
+        finished_at: Timestamp when the job completed or failed.
+        worker_id: Worker thread holding the lease on a running job.
+        heartbeat_at: Last time that worker renewed its lease.
+    """
+    __tablename__ = "index_jobs"
+    
+    job_id = Column(String, primary_key=True, default=generate_uuid)
+    source = Column(String, nullable=False)
+    filename = Column(String, nullable=False)
+    upload_path = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued", index=True)
+    chunks_processed = Column(Integer, default=0)
+    chunks_embedded = Column(Integer, default=0)
+    chunks_deduplicated = Column(Integer, default=0)
+    chunks_removed = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
@@ -0,0 +1,27 @@
+"""Message embedding model for long-term chat memory.
+
+This module defines the MessageEmbedding ORM model for the chat application.
+"""
+
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, ForeignKey
+from datetime import datetime
+from Database import Base
+
+
+class MessageEmbedding(Base):
+    """MessageEmbedding model representing the embedding of a summarized message.
+    
+    Attributes:
+        message_id: Foreign key to the embedded message (primary key).
+        session_id: Foreign key to the session the message belongs to.
+        model: Embedding model name.
+        embedding: float32 embedding vector bytes.
+        created_at: Timestamp when the message was embedded.
+    """
+    __tablename__ = "message_embeddings"
+    
+    message_id = Column(Integer, ForeignKey("messages.message_id"), primary_key=True)
+    session_id = Column(String, ForeignKey("sessions.session_id"), nullable=False, index=True)
+    model = Column(String, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
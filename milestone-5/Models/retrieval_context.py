@@ -0,0 +1,39 @@
+"""Request-scoped retrieval context.
+
+This module defines the RetrievalContext dataclass, which carries a query's
+embedding and retrieved chunks through context building, prompt rendering
+and the response so retrieval runs once per request.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RetrievalContext:
+    """Result of a single retrieval pass for one query.
+    
+    Attributes:
+        query: The user's query text.
+        top_k: Number of results requested.
+        embedding: The query embedding, computed once.
+        results: Retrieved chunks as dicts with id, content, source, score.
+    """
+    query: str
+    top_k: int
+    embedding: list[float] = None
+    results: list[dict] = field(default_factory=list)
+    
+    @property
+    def chunk_ids(self) -> list[str]:
+        """IDs of the retrieved chunks, in rank order."""
+        return [r["id"] for r in self.results]
+    
+    @property
+    def contents(self) -> list[str]:
+        """Text content of the retrieved chunks, in rank order."""
+        return [r["content"] for r in self.results]
+    
+    @property
+    def sources(self) -> list[str]:
+        """Unique sources of the retrieved chunks, in rank order."""
+        return list(dict.fromkeys(r["source"] for r in self.results))
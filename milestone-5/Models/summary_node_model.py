@@ -0,0 +1,40 @@
+"""Summary node model for hierarchical conversation summaries.
+
+This module defines the SummaryNode ORM model for the chat application.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from datetime import datetime
+from Database import Base
+
+
+class SummaryNode(Base):
+    """SummaryNode model representing one node of a session's summary tree.
+    
+    Level 0 nodes summarize one block of messages (chunk summaries); a node
+    at level n + 1 summarizes SUMMARY_FANOUT consecutive level n nodes
+    (segment summaries). Nodes without a parent are the roots; together
+    they cover every summarized message exactly once, oldest first.
+    
+    Attributes:
+        node_id: Unique identifier for the node (auto-increment).
+        session_id: Foreign key to the session.
+        level: 0 for a chunk summary, higher for segment summaries.
+        parent_id: The node this one was rolled up into (None for a root).
+        summary_text: The summarized text.
+        messages_count: Number of messages covered.
+        first_message_id: First message covered.
+        last_message_id: Last message covered.
+        created_at: Timestamp when the node was created.
+    """
+    __tablename__ = "summary_nodes"
+    
+    node_id = Column(Integer, primary_key=True, autoincrement=True)
+    session_id = Column(String, ForeignKey("sessions.session_id"), nullable=False, index=True)
+    level = Column(Integer, nullable=False, default=0)
+    parent_id = Column(Integer, ForeignKey("summary_nodes.node_id"), nullable=True, index=True)
+    summary_text = Column(Text, nullable=False)
+    messages_count = Column(Integer, nullable=False)
+    first_message_id = Column(Integer, nullable=False)
+    last_message_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
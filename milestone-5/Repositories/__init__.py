@@ -3,4 +3,7 @@
 from Repositories.user_repository import UserRepository
 from Repositories.session_repository import SessionRepository
 from Repositories.message_repository import MessageRepository
+from Repositories.message_embedding_repository import MessageEmbeddingRepository
 from Repositories.session_summary_repository import SessionSummaryRepository
+from Repositories.summary_node_repository import SummaryNodeRepository
+from Repositories.index_job_repository import IndexJobRepository
@@ -0,0 +1,191 @@
+"""Repository for IndexJob database operations.
+
+This module handles all CRUD operations for the IndexJob model.
+"""
+
+from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from Models.index_job_model import IndexJob
+
+
+class IndexJobRepository:
+    """Repository for IndexJob CRUD operations.
+    
+    Attributes:
+        db: SQLAlchemy database session.
+    """
+    
+    def __init__(self, db: Session) -> None:
+        """Initialize the repository with a database session.
+        
+        Args:
+            db: SQLAlchemy database session.
+        """
+        self.db = db
+    
+    def create(self, job_id: str, source: str, filename: str, upload_path: str) -> IndexJob:
+        """Queue a new index job.
+        
+        Args:
+            job_id: The job's UUID.
+            source: Source name to index the document under.
+            filename: Original filename.
+            upload_path: Spooled copy of the upload on disk.
+            
+        Returns:
+            The created IndexJob object.
+        """
+        job = IndexJob(job_id=job_id, source=source, filename=filename, upload_path=upload_path)
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+    
+    def get_by_id(self, job_id: str) -> IndexJob | None:
+        """Get a job by its ID.
+        
+        Args:
+            job_id: The job's UUID.
+            
+        Returns:
+            The IndexJob object if found, None otherwise.
+        """
+        return self.db.query(IndexJob).filter(IndexJob.job_id == job_id).first()
+    
+    def claim_next(self, worker_id: str, lease_seconds: float) -> IndexJob | None:
+        """Atomically take the oldest claimable job and mark it running under a lease.
+        
+        Claimable jobs are queued ones and running ones whose lease expired
+        (their worker stopped sending heartbeats). Uses SELECT ... FOR UPDATE
+        SKIP LOCKED so concurrent workers never claim the same job.
+        
+        Args:
+            worker_id: ID of the claiming worker thread.
+            lease_seconds: Seconds without a heartbeat after which a lease expires.
+            
+        Returns:
+            The claimed IndexJob object, or None if nothing is claimable.
+        """
+        job = self.db.query(IndexJob).filter(
+            or_(IndexJob.status == "queued", self._expired(lease_seconds))
+        ).order_by(IndexJob.created_at).with_for_update(skip_locked=True).first()
+        if job:
+            now = datetime.utcnow()
+            job.status = "running"
+            job.started_at = now
+            job.worker_id = worker_id
+            job.heartbeat_at = now
+            job.chunks_processed = 0
+            self.db.commit()
+            self.db.refresh(job)
+        return job
+    
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Renew a worker's lease on a running job.
+        
+        Args:
+            job_id: The job's UUID.
+            worker_id: ID of the worker thread running the job.
+            
+        Returns:
+            True if the worker still holds the lease.
+        """
+        count = self._owned(job_id, worker_id).update(
+            {"heartbeat_at": datetime.utcnow()}, synchronize_session=False
+        )
+        self.db.commit()
+        return count > 0
+    
+    def update_progress(self, job_id: str, worker_id: str, chunks_processed: int) -> None:
+        """Record how many chunks a running job has processed (also renews the lease).
+        
+        Args:
+            job_id: The job's UUID.
+            worker_id: ID of the worker thread running the job.
+            chunks_processed: Chunks processed so far.
+        """
+        self._owned(job_id, worker_id).update(
+            {"chunks_processed": chunks_processed, "heartbeat_at": datetime.utcnow()}, synchronize_session=False
+        )
+        self.db.commit()
+    
+    def mark_completed(self, job_id: str, worker_id: str, chunks: int, embedded: int, deduplicated: int,
+                       removed: int) -> bool:
+        """Mark a job as completed with its final counts.
+        
+        Args:
+            job_id: The job's UUID.
+            worker_id: ID of the worker thread running the job.
+            chunks: Total chunks of the document.
+            embedded: New or changed chunks embedded.
+            deduplicated: New chunks linked to a stored near-duplicate.
+            removed: Stale chunks removed.
+            
+        Returns:
+            True if the worker still held the lease, False if the job was reclaimed.
+        """
+        count = self._owned(job_id, worker_id).update({
+            "status": "completed",
+            "chunks_processed": chunks,
+            "chunks_embedded": embedded,
+            "chunks_deduplicated": deduplicated,
+            "chunks_removed": removed,
+            "finished_at": datetime.utcnow()
+        }, synchronize_session=False)
+        self.db.commit()
+        return count > 0
+    
+    def mark_failed(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Mark a job as failed.
+        
+        Args:
+            job_id: The job's UUID.
+            worker_id: ID of the worker thread running the job.
+            error: Error message.
+            
+        Returns:
+            True if the worker still held the lease, False if the job was reclaimed.
+        """
+        count = self._owned(job_id, worker_id).update({
+            "status": "failed",
+            "error": error,
+            "finished_at": datetime.utcnow()
+        }, synchronize_session=False)
+        self.db.commit()
+        return count > 0
+    
+    def requeue_expired(self, lease_seconds: float) -> int:
+        """Put running jobs whose worker is gone back in the queue.
+        
+        Jobs of live workers keep their lease, so starting another worker
+        process never takes over a job that is still running elsewhere.
+        
+        Args:
+            lease_seconds: Seconds without a heartbeat after which a lease expires.
+            
+        Returns:
+            Number of jobs requeued.
+        """
+        count = self.db.query(IndexJob).filter(self._expired(lease_seconds)).update(
+            {"status": "queued", "started_at": None, "worker_id": None, "heartbeat_at": None},
+            synchronize_session=False
+        )
+        self.db.commit()
+        return count
+    
+    def _owned(self, job_id: str, worker_id: str):
+        """Query for a running job, if the given worker holds its lease."""
+        return self.db.query(IndexJob).filter(
+            IndexJob.job_id == job_id,
+            IndexJob.status == "running",
+            IndexJob.worker_id == worker_id
+        )
+    
+    def _expired(self, lease_seconds: float):
+        """Filter for running jobs whose lease expired."""
+        cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+        return and_(
+            IndexJob.status == "running",
+            or_(IndexJob.heartbeat_at == None, IndexJob.heartbeat_at < cutoff)
+        )
@@ -0,0 +1,108 @@
+"""Repository for MessageEmbedding database operations.
+
+This module handles all CRUD operations for the MessageEmbedding model.
+"""
+
+from sqlalchemy.orm import Session
+from Models.message_embedding_model import MessageEmbedding
+from Models.message_model import Message
+
+
+class MessageEmbeddingRepository:
+    """Repository for MessageEmbedding CRUD operations.
+    
+    Attributes:
+        db: SQLAlchemy database session.
+    """
+    
+    def __init__(self, db: Session) -> None:
+        """Initialize the repository with a database session.
+        
+        Args:
+            db: SQLAlchemy database session.
+        """
+        self.db = db
+    
+    def create_many(self, session_id: str, model: str, embeddings: dict[int, bytes], commit: bool = True) -> None:
+        """Store message embeddings.
+        
+        Args:
+            session_id: The session's UUID.
+            model: Embedding model name.
+            embeddings: Dict of message ID to float32 vector bytes.
+            commit: Commit the change (False leaves it to the caller's transaction).
+        """
+        for message_id, embedding in embeddings.items():
+            self.db.merge(MessageEmbedding(
+                message_id=message_id,
+                session_id=session_id,
+                model=model,
+                embedding=embedding
+            ))
+        if commit:
+            self.db.commit()
+        else:
+            self.db.flush()
+    
+    def count_by_session(self, session_id: str, model: str) -> int:
+        """Count the message embeddings of a session.
+        
+        Args:
+            session_id: The session's UUID.
+            model: Embedding model name.
+            
+        Returns:
+            Number of embedded messages.
+        """
+        return self.db.query(MessageEmbedding).filter(
+            MessageEmbedding.session_id == session_id,
+            MessageEmbedding.model == model
+        ).count()
+    
+    def get_message_ids(self, session_id: str, model: str) -> list[int]:
+        """Get the IDs of a session's embedded messages.
+        
+        Args:
+            session_id: The session's UUID.
+            model: Embedding model name.
+            
+        Returns:
+            List of message IDs, oldest first.
+        """
+        return [message_id for (message_id,) in self.db.query(MessageEmbedding.message_id).filter(
+            MessageEmbedding.session_id == session_id,
+            MessageEmbedding.model == model
+        ).order_by(MessageEmbedding.message_id).all()]
+    
+    def get_by_ids(self, message_ids: list[int], model: str) -> list[tuple[int, bytes]]:
+        """Get message embeddings by message ID.
+        
+        Args:
+            message_ids: List of message IDs.
+            model: Embedding model name.
+            
+        Returns:
+            List of (message ID, float32 vector bytes) tuples.
+        """
+        return [tuple(row) for row in self.db.query(MessageEmbedding.message_id, MessageEmbedding.embedding).filter(
+            MessageEmbedding.message_id.in_(message_ids),
+            MessageEmbedding.model == model
+        ).all()]
+    
+    def get_unembedded(self, model: str, limit: int) -> list[Message]:
+        """Get summarized messages that have no embedding yet (summarized before memory existed).
+        
+        Args:
+            model: Embedding model name.
+            limit: Maximum number of messages.
+            
+        Returns:
+            List of inactive Message objects, oldest first.
+        """
+        return self.db.query(Message).outerjoin(
+            MessageEmbedding,
+            (MessageEmbedding.message_id == Message.message_id) & (MessageEmbedding.model == model)
+        ).filter(
+            Message.is_active == False,
+            MessageEmbedding.message_id == None
+        ).order_by(Message.message_id).limit(limit).all()
@@ -50,6 +50,19 @@ class MessageRepository:
         """
         return self.db.query(Message).filter(Message.session_id == session_id).order_by(Message.created_at).all()
     
+    def get_by_ids(self, message_ids: list[int]) -> list[Message]:
+        """Get messages by ID.
+        
+        Args:
+            message_ids: List of message IDs.
+            
+        Returns:
+            List of the Message objects found, oldest first.
+        """
+        return self.db.query(Message).filter(
+            Message.message_id.in_(message_ids)
+        ).order_by(Message.created_at).all()
+    
     def get_active(self, session_id: str) -> list[Message]:
         """Get active (not summarized) messages for a session.
         
@@ -64,11 +77,12 @@ class MessageRepository:
             Message.is_active == True
         ).order_by(Message.created_at).all()
     
-    def mark_inactive(self, message_ids: list[int]) -> int:
+    def mark_inactive(self, message_ids: list[int], commit: bool = True) -> int:
         """Mark messages as inactive (summarized).
         
         Args:
             message_ids: List of message IDs to mark as inactive.
+            commit: Commit the change (False leaves it to the caller's transaction).
             
         Returns:
             Number of messages updated.
@@ -76,7 +90,8 @@ class MessageRepository:
         count = self.db.query(Message).filter(
             Message.message_id.in_(message_ids)
         ).update({"is_active": False}, synchronize_session=False)
-        self.db.commit()
+        if commit:
+            self.db.commit()
         return count
     
     def count_active(self, session_id: str) -> int:
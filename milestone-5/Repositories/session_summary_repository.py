@@ -3,6 +3,8 @@
 This module handles all CRUD operations for the SessionSummary model.
 """
 
+import hashlib
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from Models.session_summary_model import SessionSummary
 
@@ -22,6 +24,23 @@ class SessionSummaryRepository:
         """
         self.db = db
     
+    def try_lock(self, session_id: str) -> bool:
+        """Try to take the session's summary lock for the current transaction.
+        
+        Uses a transaction-level Postgres advisory lock, so it serializes
+        summarization of a session across threads and processes and is
+        released when the transaction commits or rolls back.
+        
+        Args:
+            session_id: The session's UUID.
+            
+        Returns:
+            True if the lock was taken, False if another transaction holds it.
+        """
+        digest = hashlib.blake2b(f"session_summary:{session_id}".encode(), digest_size=8).digest()
+        key = int.from_bytes(digest, "big", signed=True)
+        return self.db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}).scalar()
+    
     def get_by_session(self, session_id: str) -> SessionSummary | None:
         """Get the summary for a session.
         
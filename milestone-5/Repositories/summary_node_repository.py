@@ -0,0 +1,100 @@
+"""Repository for SummaryNode database operations.
+
+This module handles all CRUD operations for the SummaryNode model.
+"""
+
+from sqlalchemy.orm import Session
+from Models.summary_node_model import SummaryNode
+
+
+class SummaryNodeRepository:
+    """Repository for SummaryNode CRUD operations.
+    
+    Attributes:
+        db: SQLAlchemy database session.
+    """
+    
+    def __init__(self, db: Session) -> None:
+        """Initialize the repository with a database session.
+        
+        Args:
+            db: SQLAlchemy database session.
+        """
+        self.db = db
+    
+    def create(self, session_id: str, level: int, summary_text: str, children: list[SummaryNode] = None,
+               messages: list = None, commit: bool = True) -> SummaryNode:
+        """Create a summary node covering either messages or child nodes.
+        
+        Args:
+            session_id: The session's UUID.
+            level: Node level (0 for a chunk summary of messages).
+            summary_text: The summary text.
+            children: Consecutive nodes rolled up into this one (they get it as parent).
+            messages: Consecutive messages summarized by a level 0 node.
+            commit: Commit the change (False flushes it into the caller's transaction).
+            
+        Returns:
+            The created SummaryNode object.
+        """
+        if children:
+            node = SummaryNode(
+                session_id=session_id,
+                level=level,
+                summary_text=summary_text,
+                messages_count=sum(child.messages_count for child in children),
+                first_message_id=children[0].first_message_id,
+                last_message_id=children[-1].last_message_id
+            )
+        else:
+            node = SummaryNode(
+                session_id=session_id,
+                level=level,
+                summary_text=summary_text,
+                messages_count=len(messages),
+                first_message_id=messages[0].message_id,
+                last_message_id=messages[-1].message_id
+            )
+        self.db.add(node)
+        self.db.flush()
+        
+        for child in children or []:
+            child.parent_id = node.node_id
+        
+        if commit:
+            self.db.commit()
+            self.db.refresh(node)
+        else:
+            self.db.flush()
+        return node
+    
+    def get_roots(self, session_id: str, level: int = None) -> list[SummaryNode]:
+        """Get the nodes of a session that were not rolled up yet.
+        
+        Args:
+            session_id: The session's UUID.
+            level: Only return roots at this level.
+            
+        Returns:
+            List of root SummaryNode objects, oldest first.
+        """
+        query = self.db.query(SummaryNode).filter(
+            SummaryNode.session_id == session_id,
+            SummaryNode.parent_id == None
+        )
+        if level is not None:
+            query = query.filter(SummaryNode.level == level)
+        return query.order_by(SummaryNode.first_message_id).all()
+    
+    def get_children(self, node_id: int) -> list[SummaryNode]:
+        """Get the nodes rolled up into a node.
+        
+        Args:
+            node_id: The parent node's ID.
+            
+        Returns:
+            List of child SummaryNode objects, oldest first.
+        """
+        return self.db.query(SummaryNode).filter(
+            SummaryNode.parent_id == node_id
+        ).order_by(SummaryNode.first_message_id).all()
@@ -6,3 +6,4 @@ from Routes.ask_routes import router as ask_router
 from Routes.chat_routes import router as chat_router
 from Routes.user_routes import router as user_router
 from Routes.history_routes import router as history_router
+from Routes.stats_routes import router as stats_router
@@ -1,11 +1,40 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
 from Controllers.ask_controller import AskController
+from Services.model_registry import ModelRegistry, get_registry
 from Schemas.api_schemas import AskRequest, AskResponse
 
 router = APIRouter()
 
 
 @router.post("/ask", response_model=AskResponse)
-def ask_question(request: AskRequest):
-    """Ask a question and get an LLM-generated answer using RAG."""
-    return AskController(model_name="gemma3:1b").ask(request.query, request.top_k)
+async def ask_question(
+    request: AskRequest,
+    registry: ModelRegistry = Depends(get_registry),
+    x_cache_bypass: bool = Header(False)
+):
+    """Ask a question and get an LLM-generated answer using RAG.
+    
+    Send the `X-Cache-Bypass: true` header to skip the semantic answer cache.
+    """
+    return await AskController(registry, model_name="gemma3:1b").aask(
+        request.query, request.top_k, use_cache=not x_cache_bypass
+    )
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(
+    request: AskRequest,
+    registry: ModelRegistry = Depends(get_registry),
+    x_cache_bypass: bool = Header(False)
+):
+    """Ask a question and stream the answer as Server-Sent Events.
+    
+    Emits a `sources` event first, then `token` events as the LLM generates,
+    then a `done` event with the full answer.
+    """
+    controller = AskController(registry, model_name="gemma3:1b")
+    return StreamingResponse(
+        controller.aask_stream(request.query, request.top_k, use_cache=not x_cache_bypass),
+        media_type="text/event-stream"
+    )
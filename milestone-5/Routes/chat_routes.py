@@ -4,24 +4,68 @@ This module defines the chat endpoint.
 """
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from Database import get_db
+from Database import get_db, SessionLocal
 from Controllers.chat_controller import ChatController
+from Services.model_registry import ModelRegistry, get_registry
+from Services.summary_worker import SummaryWorker, get_summary_worker
 from Schemas.api_schemas import ChatRequest, ChatResponse
 
 router = APIRouter()
 
 
 @router.post("/chat", response_model=ChatResponse)
-def chat(request: ChatRequest, db: Session = Depends(get_db)):
+async def chat(
+    request: ChatRequest,
+    db: Session = Depends(get_db),
+    registry: ModelRegistry = Depends(get_registry),
+    summary_worker: SummaryWorker = Depends(get_summary_worker)
+):
     """Send a message and get a response with history context.
     
     Args:
         request: ChatRequest with user_id, session_id, and message.
         db: Database session (injected).
-        
+        registry: Shared model registry (injected).
+        summary_worker: Background summary worker (injected).
+    
     Returns:
         ChatResponse with session_id, answer, and sources.
     """
-    controller = ChatController(db)
-    return controller.chat(request.user_id, request.session_id, request.message)
+    controller = ChatController(db, registry, summary_worker)
+    return await controller.achat(request.user_id, request.session_id, request.message)
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    registry: ModelRegistry = Depends(get_registry),
+    summary_worker: SummaryWorker = Depends(get_summary_worker)
+):
+    """Send a message and stream the response as Server-Sent Events.
+    
+    Emits a `sources` event (with the session_id) first, then `token` events
+    as the LLM generates, then a `done` event once the assistant message is
+    saved.
+    
+    Args:
+        request: ChatRequest with user_id, session_id, and message.
+        registry: Shared model registry (injected).
+        summary_worker: Background summary worker (injected).
+    
+    Returns:
+        StreamingResponse of text/event-stream events.
+    """
+    async def events():
+        # The stream outlives the request handler, so it owns its DB session
+        db = SessionLocal()
+        try:
+            async for event in ChatController(db, registry, summary_worker).achat_stream(
+                request.user_id, request.session_id, request.message
+            ):
+                yield event
+        finally:
+            db.close()
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,33 +1,100 @@
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
+from sqlalchemy.orm import Session
+from Database import get_db
 from Controllers.index_controller import IndexController
-from Schemas.api_schemas import IndexResponse
+from Services.model_registry import ModelRegistry, get_registry
+from Services.index_worker import IndexWorker, get_index_worker
+from Schemas.api_schemas import IndexResponse, IndexJobResponse
 
 router = APIRouter()
 
 
-
-@router.post("/index", response_model=IndexResponse)
-async def index_document(
+@router.post("/index", response_model=IndexJobResponse, status_code=202)
+def index_document(
     file: Optional[UploadFile] = File(None),
     content: Optional[str] = Form(None),
-    source: str = Form("document.txt")
+    source: str = Form("document.txt"),
+    db: Session = Depends(get_db),
+    registry: ModelRegistry = Depends(get_registry),
+    worker: IndexWorker = Depends(get_index_worker)
 ):
-    """Index a document (file upload OR raw text).
+    """Queue a document for indexing (file upload OR raw text).
     
     - Send a file: use 'file' field
     - Send raw text: use 'content' field (source defaults to 'document.txt')
+    
+    Poll GET /index/jobs/{job_id} for progress.
+    
+    Raises:
+        HTTPException: If neither a file nor content is given.
+    """
+    controller = IndexController(registry, db, worker)
+    if file:
+        return controller.submit_file(file.file, file.filename)
+    
+    if content:
+        return controller.submit_text(content, source)
+    
+    raise HTTPException(status_code=400, detail="Provide either a file OR content")
+
+
+@router.get("/index/jobs/{job_id}", response_model=IndexJobResponse)
+def get_index_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    registry: ModelRegistry = Depends(get_registry)
+):
+    """Get the state, chunks processed and throughput of an index job.
+    
+    Raises:
+        HTTPException: If the job is not found.
     """
+    job = IndexController(registry, db).get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.put("/index/{source:path}", response_model=IndexJobResponse, status_code=202)
+def replace_document(
+    source: str,
+    file: Optional[UploadFile] = File(None),
+    content: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+    registry: ModelRegistry = Depends(get_registry),
+    worker: IndexWorker = Depends(get_index_worker)
+):
+    """Queue a document to create or replace the one stored under a source name.
+    
+    Only new or changed chunks are embedded; chunks of the previous version
+    that no longer occur are removed.
+    
+    - Send a file: use 'file' field (its filename only selects the loader)
+    - Send raw text: use 'content' field
+    
+    Raises:
+        HTTPException: If neither a file nor content is given.
+    """
+    controller = IndexController(registry, db, worker)
     if file:
-        file_bytes = await file.read()
-        return IndexController().index_file(file_bytes, file.filename)
+        return controller.submit_file(file.file, file.filename, source)
     
     if content:
-        return IndexController().index_text(content, source)
+        return controller.submit_text(content, source)
     
-    return IndexResponse(
-        success=False,
-        message="Provide either a file OR content",
-        chunks_indexed=0
-    )
+    raise HTTPException(status_code=400, detail="Provide either a file OR content")
 
+
+@router.delete("/index/{source:path}", response_model=IndexResponse)
+async def delete_document(source: str, registry: ModelRegistry = Depends(get_registry)):
+    """Remove every chunk of a document from the vector store and keyword index.
+    
+    Raises:
+        HTTPException: If no chunks are indexed for the source.
+    """
+    response = await run_in_threadpool(IndexController(registry).delete_source, source)
+    if not response:
+        raise HTTPException(status_code=404, detail="Source not found")
+    return response
@@ -1,13 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from Controllers.retrieval_controller import RetrievalController
-from Schemas.api_schemas import SearchRequest, SearchResponse
+from Services.model_registry import ModelRegistry, get_registry
+from Schemas.api_schemas import SearchRequest, SearchResponse, BatchSearchRequest, BatchSearchResponse
 
 router = APIRouter()
 
 
 @router.post("/search", response_model=SearchResponse)
-def search_documents(request: SearchRequest):
+async def search_documents(request: SearchRequest, registry: ModelRegistry = Depends(get_registry)):
     """Search indexed documents."""
-    return RetrievalController().search(request.query, request.top_k)
+    return await RetrievalController(registry).asearch(request.query, request.top_k, request.mode)
 
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_documents_batch(request: BatchSearchRequest, registry: ModelRegistry = Depends(get_registry)):
+    """Search indexed documents for many queries in one embedding batch."""
+    return await RetrievalController(registry).asearch_batch(request.queries)
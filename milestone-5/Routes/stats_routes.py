@@ -0,0 +1,24 @@
+"""Routes for runtime statistics.
+
+This module defines the stats endpoint.
+"""
+
+from fastapi import APIRouter, Depends
+from Controllers.stats_controller import StatsController
+from Services.model_registry import ModelRegistry, get_registry
+from Schemas.api_schemas import StatsResponse
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=StatsResponse)
+def get_stats(registry: ModelRegistry = Depends(get_registry)):
+    """Get cache sizes and hit rates.
+    
+    Args:
+        registry: Shared model registry (injected).
+        
+    Returns:
+        StatsResponse with per-cache statistics.
+    """
+    return StatsController(registry).get_stats()
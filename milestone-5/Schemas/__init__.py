@@ -3,9 +3,12 @@
 from Schemas.api_schemas import (
     IndexTextRequest,
     IndexResponse,
+    IndexJobResponse,
     SearchRequest,
     SearchResult,
     SearchResponse,
+    BatchSearchRequest,
+    BatchSearchResponse,
     AskRequest,
     AskResponse,
     CreateUserRequest,
@@ -16,4 +19,9 @@ from Schemas.api_schemas import (
     SessionListResponse,
     MessageItem,
     HistoryResponse,
+    CacheStats,
+    VectorStoreStats,
+    EmbeddingEngineStats,
+    EmbeddingCacheStats,
+    StatsResponse,
 )
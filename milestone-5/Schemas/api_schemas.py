@@ -5,7 +5,7 @@ This module defines all Pydantic models for the API endpoints.
 
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal
 
 
 # ============ INDEX ENDPOINT ============
@@ -17,18 +17,53 @@ class IndexTextRequest(BaseModel):
 
 
 class IndexResponse(BaseModel):
-    """Response for POST /index."""
+    """Response for POST /index.
+    
+    chunks_indexed counts every chunk of the document; only chunks_embedded
+    of them were new or changed. chunks_deduplicated new chunks were
+    near-duplicates of stored chunks and were linked to them instead of
+    stored. chunks_removed counts chunks of an earlier version of the
+    document that no longer exist.
+    """
     success: bool
     message: str
     chunks_indexed: int
+    chunks_embedded: int = 0
+    chunks_deduplicated: int = 0
+    chunks_removed: int = 0
+
+
+class IndexJobResponse(BaseModel):
+    """Response for POST /index, PUT /index/{source} and GET /index/jobs/{job_id}.
+    
+    status is "queued", "running", "completed" or "failed". chunks_per_second
+    is the job's throughput since it started (None while queued).
+    """
+    job_id: str
+    source: str
+    status: str
+    chunks_processed: int
+    chunks_embedded: int
+    chunks_deduplicated: int
+    chunks_removed: int
+    chunks_per_second: Optional[float] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 # ============ SEARCH ENDPOINT ============
 
 class SearchRequest(BaseModel):
-    """Request for POST /search."""
+    """Request for POST /search.
+    
+    mode "hybrid" fuses vector and BM25 keyword rankings; its scores are
+    reciprocal-rank-fusion scores (higher is better) instead of distances.
+    """
     query: str
     top_k: int = 5
+    mode: Literal["vector", "hybrid"] = "vector"
 
 
 class SearchResult(BaseModel):
@@ -44,6 +79,16 @@ class SearchResponse(BaseModel):
     results: list[SearchResult]
 
 
+class BatchSearchRequest(BaseModel):
+    """Request for POST /search/batch."""
+    queries: list[SearchRequest]
+
+
+class BatchSearchResponse(BaseModel):
+    """Response for POST /search/batch (one entry per query, in order)."""
+    results: list[SearchResponse]
+
+
 # ============ ASK ENDPOINT ============
 
 class AskRequest(BaseModel):
@@ -57,6 +102,7 @@ class AskResponse(BaseModel):
     query: str
     answer: str
     sources: list[str]
+    cached: bool = False
 
 
 # ============ USER ENDPOINTS ============
@@ -114,3 +160,52 @@ class HistoryResponse(BaseModel):
     """Response for GET /history/{session_id}."""
     session_id: str
     messages: list[MessageItem]
+
+
+# ============ STATS ENDPOINT ============
+
+class CacheStats(BaseModel):
+    """Statistics for a single cache."""
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class VectorStoreStats(BaseModel):
+    """Statistics for a vector store."""
+    backend: str
+    count: int
+    quantization: str = "none"
+    ivf: bool = False
+    bytes_per_vector: Optional[int] = None
+    recall_at_k: Optional[float] = None
+
+
+class EmbeddingEngineStats(BaseModel):
+    """Throughput of a document embedding engine."""
+    processes: int
+    batch_size: int
+    embedded: int
+    seconds: float
+    embeddings_per_second: float
+
+
+class EmbeddingCacheStats(BaseModel):
+    """Statistics for the persistent chunk embedding cache."""
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class StatsResponse(BaseModel):
+    """Response for GET /stats."""
+    query_embedding_cache: CacheStats
+    answer_cache: CacheStats
+    vector_stores: dict[str, VectorStoreStats]
+    embedding_engines: dict[str, EmbeddingEngineStats] = {}
+    embedding_cache: EmbeddingCacheStats | None = None
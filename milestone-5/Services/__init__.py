@@ -1,7 +1,12 @@
 """Services module for business logic."""
 
+from Services.model_registry import ModelRegistry, get_registry
 from Services.index_service import IndexService
+from Services.index_job_service import IndexJobService
+from Services.index_worker import IndexWorker, get_index_worker
 from Services.retrieval_service import RetrievalService
 from Services.llm_service import LLMService
 from Services.chat_service import ChatService
 from Services.summary_service import SummaryService
+from Services.memory_service import MemoryService
+from Services.summary_worker import SummaryWorker, get_summary_worker
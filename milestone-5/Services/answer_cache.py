@@ -0,0 +1,148 @@
+"""Semantic answer cache for RAG question-answering.
+
+This module provides the SemanticAnswerCache class, which returns a stored
+answer when a new query's embedding is close enough to a previously answered
+one and the index has not changed since.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass
+class CachedAnswer:
+    """A cached answer and the retrieval it was generated from.
+    
+    Attributes:
+        embedding: Normalized query embedding.
+        top_k: Number of chunks retrieved for the answer.
+        generation: Index generation the answer was generated against.
+        chunk_ids: IDs of the retrieved chunks.
+        answer: The generated answer.
+        sources: Sources of the retrieved chunks.
+        expires_at: Monotonic time after which the entry is stale.
+    """
+    embedding: np.ndarray
+    top_k: int
+    generation: int
+    chunk_ids: list[str]
+    answer: str
+    sources: list[str]
+    expires_at: float
+
+
+class SemanticAnswerCache:
+    """Bounded cache of answers looked up by cosine similarity.
+    
+    Attributes:
+        max_size: Maximum number of entries kept.
+        ttl_seconds: Lifetime of an entry in seconds.
+        threshold: Minimum cosine similarity for a cache hit.
+        hits: Number of successful lookups.
+        misses: Number of failed lookups.
+    """
+    
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 600, threshold: float = 0.95) -> None:
+        """Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries kept.
+            ttl_seconds: Lifetime of an entry in seconds.
+            threshold: Minimum cosine similarity for a cache hit.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[int, CachedAnswer] = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+    
+    def lookup(self, embedding: list[float], top_k: int, generation: int) -> CachedAnswer | None:
+        """Find the most similar live answer for the same top_k and generation.
+        
+        Args:
+            embedding: Query embedding.
+            top_k: Number of chunks the caller would retrieve.
+            generation: Current index generation.
+        
+        Returns:
+            The best matching CachedAnswer, or None if none exceeds the threshold.
+        """
+        query = _normalize(embedding)
+        now = time.monotonic()
+        with self._lock:
+            for entry_id in [i for i, e in self._entries.items() if e.expires_at < now or e.generation != generation]:
+                del self._entries[entry_id]
+            
+            candidates = [(i, e) for i, e in self._entries.items() if e.top_k == top_k]
+            if candidates:
+                matrix = np.stack([e.embedding for _, e in candidates])
+                scores = matrix @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    entry_id, entry = candidates[best]
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    return entry
+            self.misses += 1
+            return None
+    
+    def add(self, embedding: list[float], top_k: int, generation: int,
+            chunk_ids: list[str], answer: str, sources: list[str]) -> None:
+        """Store an answer, evicting the least recently used entry if full.
+        
+        Args:
+            embedding: Query embedding.
+            top_k: Number of chunks retrieved for the answer.
+            generation: Index generation the answer was generated against.
+            chunk_ids: IDs of the retrieved chunks.
+            answer: The generated answer.
+            sources: Sources of the retrieved chunks.
+        """
+        entry = CachedAnswer(
+            embedding=_normalize(embedding),
+            top_k=top_k,
+            generation=generation,
+            chunk_ids=chunk_ids,
+            answer=answer,
+            sources=sources,
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        with self._lock:
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Get cache size and hit-rate statistics.
+        
+        Returns:
+            Dict with size, max_size, hits, misses and hit_rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+def _normalize(embedding: list[float]) -> np.ndarray:
+    """Convert an embedding to a unit-length float32 vector."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -3,11 +3,18 @@
 This module provides the ChatService class for context-aware chat.
 """
 
+import asyncio
+from typing import AsyncIterator
 from sqlalchemy.orm import Session
+from Models.message_model import Message
 from Repositories import MessageRepository, SessionRepository, SessionSummaryRepository
 from Services.retrieval_service import RetrievalService
 from Services.llm_service import LLMService
 from Services.summary_service import SummaryService
+from Services.summary_worker import SummaryWorker
+from Services.memory_service import MemoryService
+from Services.model_registry import ModelRegistry
+from Models.retrieval_context import RetrievalContext
 from Config import settings
 
 
@@ -22,24 +29,36 @@ class ChatService:
         retrieval_service: Service for document retrieval.
         llm_service: Service for LLM generation.
         summary_service: Service for summarization.
+        summary_worker: Background summary worker (None summarizes inline).
+        memory_service: Service for long-term message memory.
     """
     
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, registry: ModelRegistry, summary_worker: SummaryWorker = None) -> None:
         """Initialize the chat service.
         
         Args:
             db: SQLAlchemy database session.
+            registry: Shared model registry.
+            summary_worker: Background summary worker; without one, old
+                messages are summarized on the request path.
         """
         self.db = db
+        self.registry = registry
         self.message_repo = MessageRepository(db)
         self.session_repo = SessionRepository(db)
         self.summary_repo = SessionSummaryRepository(db)
-        self.retrieval_service = RetrievalService()
-        self.llm_service = LLMService()
-        self.summary_service = SummaryService(db)
+        self.retrieval_service = RetrievalService(registry)
+        self.llm_service = LLMService(registry)
+        self.summary_service = SummaryService(db, registry)
+        self.summary_worker = summary_worker
+        self.memory_service = MemoryService(db, registry, self.retrieval_service.embed_model)
     
-    def chat(self, session_id: str, user_message: str) -> dict:
-        """Process a chat message and generate a response.
+    async def achat(self, session_id: str, user_message: str) -> dict:
+        """Process a chat message without blocking the event loop.
+        
+        Database calls run on the registry's DB executor, retrieval on the
+        embedding and vector store executors, and generation on the async
+        Ollama client.
         
         Args:
             session_id: The session's UUID.
@@ -48,53 +67,156 @@ class ChatService:
         Returns:
             Dict with answer and sources.
         """
+        retrieval, context = await self._aprepare_turn(session_id, user_message)
+        
+        # 5. Generate response
+        answer = await self.llm_service.agenerate(user_message, context)
+        
+        # 6. Save assistant message
+        await self._run_db(self.message_repo.create, session_id, "assistant", answer)
+        
+        return {
+            "answer": answer,
+            "sources": retrieval.sources
+        }
+    
+    async def achat_stream(self, session_id: str, user_message: str) -> AsyncIterator[tuple[str, dict]]:
+        """Process a chat message without blocking, streaming the response as it is generated.
+        
+        Args:
+            session_id: The session's UUID.
+            user_message: The user's message.
+            
+        Yields:
+            (event, data) pairs: one "sources" event, then "token" events,
+            then a "done" event once the assistant message is saved.
+        """
+        retrieval, context = await self._aprepare_turn(session_id, user_message)
+        yield "sources", {"session_id": session_id, "sources": retrieval.sources}
+        
+        # 5. Stream response
+        tokens = []
+        async for token in self.llm_service.astream(user_message, context):
+            tokens.append(token)
+            yield "token", {"content": token}
+        answer = "".join(tokens)
+        
+        # 6. Save assistant message once the stream completes
+        await self._run_db(self.message_repo.create, session_id, "assistant", answer)
+        yield "done", {"session_id": session_id, "answer": answer}
+    
+    async def _aprepare_turn(self, session_id: str, user_message: str) -> tuple[RetrievalContext, list[str]]:
+        """Save the user message and gather everything needed to answer it without blocking.
+        
+        Args:
+            session_id: The session's UUID.
+            user_message: The user's message.
+            
+        Returns:
+            The retrieval for this turn and the prompt context.
+        """
+        # 1-2. Save user message and queue summarization if needed
+        await self._run_db(self._record_user_message, session_id, user_message)
+        
+        # 3-4. Retrieve documents and load history concurrently, then build context
+        return await self._abuild_context(session_id, user_message)
+    
+    def _record_user_message(self, session_id: str, user_message: str) -> None:
+        """Save the user message and queue old history for summarization if it grew too long.
+        
+        Args:
+            session_id: The session's UUID.
+            user_message: The user's message.
+        """
         # 1. Save user message
         self.message_repo.create(session_id, "user", user_message)
         
-        # 2. Check if summarization is needed
+        # 2. Summarize a block of old messages once the high watermark is reached
         active_count = self.message_repo.count_active(session_id)
-        if active_count > settings.MAX_HISTORY_MESSAGES:
-            self.summary_service.summarize_old_messages(session_id)
-        
-        # 3. Build context from history + RAG
-        context = self._build_context(session_id, user_message)
+        if self.summary_service.should_summarize(active_count):
+            if self.summary_worker is not None:
+                self.summary_worker.submit(session_id)
+            else:
+                self.summary_service.summarize_old_messages(session_id)
+    
+    async def _abuild_context(self, session_id: str, user_message: str) -> tuple[RetrievalContext, list[str]]:
+        """Load chat history and run retrieval concurrently, then build context.
         
-        # 4. Generate response
-        answer = self.llm_service.generate(user_message, context)
+        The query is embedded once for both. History loading (including
+        memory recall) then only touches the database and retrieval only the
+        vector store, so the two run side by side on their own executors.
         
-        # 5. Save assistant message
-        self.message_repo.create(session_id, "assistant", answer)
+        Args:
+            session_id: The session's UUID.
+            user_message: The user's message.
+            
+        Returns:
+            The retrieval for this turn and the list of context strings.
+        """
+        embedding = await self.retrieval_service.aembed_query(user_message)
+        (summaries, memories, recent_messages), retrieval = await asyncio.gather(
+            self._run_db(self._load_history, session_id, embedding),
+            self.retrieval_service.aretrieve(
+                user_message, settings.TOP_K, embedding=embedding, mode=settings.RETRIEVAL_MODE
+            )
+        )
+        return retrieval, self._format_context(summaries, memories, recent_messages, retrieval)
+    
+    def _load_history(self, session_id: str, embedding: list[float] = None) -> tuple[list[str], list[Message], list[Message]]:
+        """Load the latest completed summaries, recalled memories and the active messages.
         
-        # 6. Get sources from RAG results
-        rag_results = self.retrieval_service.search(user_message, settings.TOP_K)
-        sources = list(set([r["source"] for r in rag_results]))
+        Every active message is returned: messages past MAX_HISTORY_MESSAGES
+        are not in the summary until the summary worker folds the next block
+        in, so nothing drops out of the context while a summary is pending.
+        The summaries are the levels of the session's summary tree that fit
+        SUMMARY_TOKEN_BUDGET (see SummaryService.select_summaries), and the
+        memories the summarized messages most relevant to the user's message
+        (see MemoryService.recall).
         
-        return {
-            "answer": answer,
-            "sources": sources
-        }
+        Args:
+            session_id: The session's UUID.
+            embedding: Embedding of the user's message, for memory recall.
+            
+        Returns:
+            The summary texts (oldest first), the recalled messages and the
+            active messages.
+        """
+        # Messages first: if a summary commits in between, its block appears
+        # twice for this turn instead of not at all
+        messages = self.message_repo.get_active(session_id)
+        memories = []
+        if settings.MEMORY_ENABLED and embedding is not None:
+            memories = self.memory_service.recall(session_id, embedding)
+        return self.summary_service.select_summaries(session_id), memories, messages
     
-    def _build_context(self, session_id: str, query: str) -> list[str]:
-        """Build context from chat history and RAG retrieval.
+    def _format_context(self, summaries: list[str], memories: list[Message], recent_messages: list[Message],
+                        retrieval: RetrievalContext) -> list[str]:
+        """Format history and retrieved documents into prompt context.
         
         Args:
-            session_id: The session's UUID.
-            query: The user's query for RAG retrieval.
+            summaries: Summaries of older history, oldest first.
+            memories: Summarized messages relevant to the user's message, oldest first.
+            recent_messages: Recent active messages, oldest first.
+            retrieval: Retrieval results for the user's query.
             
         Returns:
             List of context strings.
         """
         context = []
         
-        # Add summary if exists
-        summary = self.summary_repo.get_by_session(session_id)
-        if summary:
-            context.append(f"[CONVERSATION SUMMARY]\n{summary.summary_text}")
+        # Add summaries if exist
+        if summaries:
+            context.append("[CONVERSATION SUMMARY]\n" + "\n".join(summaries))
         
-        # Add active messages (recent history) - clearly labeled
-        active_messages = self.message_repo.get_active(session_id)
-        recent_messages = active_messages[-settings.MAX_HISTORY_MESSAGES:]
+        # Add recalled earlier messages - clearly labeled
+        if memories:
+            memory_text = "[EARLIER MESSAGES - Recalled from this conversation]\n"
+            for msg in memories:
+                role_label = "User" if msg.role == "user" else "Assistant"
+                memory_text += f"{role_label}: {msg.content}\n"
+            context.append(memory_text)
         
+        # Add active messages (recent history) - clearly labeled
         if recent_messages:
             history_text = "[CHAT HISTORY - Previous messages in this conversation]\n"
             for msg in recent_messages:
@@ -103,11 +225,14 @@ class ChatService:
             context.append(history_text)
         
         # Add RAG results - clearly labeled
-        rag_results = self.retrieval_service.search(query, settings.TOP_K)
-        if rag_results:
+        if retrieval.results:
             docs_text = "[COMPANY DOCUMENTS - Retrieved information]\n"
-            for result in rag_results:
-                docs_text += f"- {result['content']}\n"
+            for content in retrieval.contents:
+                docs_text += f"- {content}\n"
             context.append(docs_text)
         
         return context
+    
+    async def _run_db(self, func, *args):
+        """Run a blocking database call on the registry's DB executor."""
+        return await self.registry.run_in(self.registry.db_executor, func, *args)
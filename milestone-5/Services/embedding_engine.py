@@ -0,0 +1,143 @@
+"""Batched, multi-process document embedding for indexing.
+
+This module provides the EmbeddingEngine class, which sorts chunk texts by
+length, cuts them into fixed-size batches and embeds the batches in parallel
+on a pool of worker processes that each load the embedding model once.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from langchain_huggingface import HuggingFaceEmbeddings
+
+# Embedding model of a worker process (set by _init_worker)
+_worker_embeddings = None
+
+
+def _init_worker(model_name: str, batch_size: int, threads: int) -> None:
+    """Load the embedding model once per worker process."""
+    global _worker_embeddings
+    import torch
+    torch.set_num_threads(threads)
+    _worker_embeddings = HuggingFaceEmbeddings(model_name=model_name, encode_kwargs={"batch_size": batch_size})
+
+
+def _embed_batch(texts: list[str]) -> list[list[float]]:
+    """Embed one batch in a worker process."""
+    return _worker_embeddings.embed_documents(texts)
+
+
+class EmbeddingEngine:
+    """Embeds document batches in-process or on a pool of worker processes.
+    
+    Attributes:
+        model_name: HuggingFace model name.
+        processes: Worker processes (0 embeds in-process).
+        batch_size: Texts per model call.
+        threads_per_process: Torch threads in each worker process.
+        sort_by_length: Whether to group texts of similar length to minimize padding.
+        embedded: Number of texts embedded so far.
+        seconds: Wall time spent embedding.
+    """
+    
+    def __init__(self, model_name: str, processes: int = 0, batch_size: int = 32,
+                 threads_per_process: int = 1, sort_by_length: bool = True,
+                 embeddings: HuggingFaceEmbeddings = None) -> None:
+        """Initialize the engine.
+        
+        Args:
+            model_name: HuggingFace model name.
+            processes: Worker processes (0 embeds in-process).
+            batch_size: Texts per model call.
+            threads_per_process: Torch threads in each worker process.
+            sort_by_length: Whether to group texts of similar length to minimize padding.
+            embeddings: Loaded model used when processes is 0.
+        """
+        self.model_name = model_name
+        self.processes = processes
+        self.batch_size = batch_size
+        self.threads_per_process = threads_per_process
+        self.sort_by_length = sort_by_length
+        self.embedded = 0
+        self.seconds = 0.0
+        self._embeddings = embeddings
+        self._executor = None
+        self._lock = threading.Lock()
+    
+    @property
+    def preferred_batch_size(self) -> int:
+        """Texts per embed_documents call that keep every worker busy."""
+        return self.batch_size * max(self.processes, 1)
+    
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts, returning vectors in input order.
+        
+        Args:
+            texts: Chunk texts.
+        
+        Returns:
+            One embedding vector per text.
+        """
+        if not texts:
+            return []
+        started = time.perf_counter()
+        
+        order = list(range(len(texts)))
+        if self.sort_by_length:
+            order.sort(key=lambda i: len(texts[i]))
+        batches = [
+            [texts[i] for i in order[start:start + self.batch_size]]
+            for start in range(0, len(order), self.batch_size)
+        ]
+        
+        if self.processes > 0:
+            results = self._get_executor().map(_embed_batch, batches)
+        else:
+            results = map(self._embeddings.embed_documents, batches)
+        
+        vectors = [None] * len(texts)
+        position = 0
+        for batch_vectors in results:
+            for vector in batch_vectors:
+                vectors[order[position]] = vector
+                position += 1
+        
+        with self._lock:
+            self.embedded += len(texts)
+            self.seconds += time.perf_counter() - started
+        return vectors
+    
+    def stats(self) -> dict:
+        """Get throughput statistics.
+        
+        Returns:
+            Dict with processes, batch_size, embedded, seconds and embeddings_per_second.
+        """
+        with self._lock:
+            return {
+                "processes": self.processes,
+                "batch_size": self.batch_size,
+                "embedded": self.embedded,
+                "seconds": round(self.seconds, 3),
+                "embeddings_per_second": self.embedded / self.seconds if self.seconds else 0.0
+            }
+    
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.batch_size, self.threads_per_process)
+                )
+            return self._executor
@@ -0,0 +1,86 @@
+"""Index job service for submitting documents to the background queue.
+
+This module provides the IndexJobService class, which spools uploads to
+disk and records them as queued IndexJob rows for the IndexWorker.
+"""
+
+import os
+import shutil
+from typing import BinaryIO
+from sqlalchemy.orm import Session
+from Models.index_job_model import IndexJob
+from Repositories import IndexJobRepository
+from Utils.id_generator import generate_uuid
+from Utils.file_loader import COPY_BUFFER_SIZE
+
+
+class IndexJobService:
+    """Service for submitting and looking up background index jobs.
+    
+    Attributes:
+        db: SQLAlchemy database session.
+        job_repo: Repository for index job operations.
+        upload_dir: Directory holding spooled uploads until their job finishes.
+    """
+    
+    def __init__(self, db: Session, storage_dir: str = "milestone-5/storage") -> None:
+        """Initialize the index job service.
+        
+        Args:
+            db: SQLAlchemy database session.
+            storage_dir: Root storage directory of the index.
+        """
+        self.db = db
+        self.job_repo = IndexJobRepository(db)
+        self.upload_dir = os.path.join(storage_dir, "uploads")
+    
+    def submit_file(self, file: BinaryIO, filename: str, source: str = None) -> IndexJob:
+        """Spool an upload to disk and queue it for indexing.
+        
+        Args:
+            file: Binary file object (e.g. a spooled upload).
+            filename: Original filename (selects the loader).
+            source: Source name to index under (defaults to filename).
+            
+        Returns:
+            The queued IndexJob object.
+        """
+        job_id = generate_uuid()
+        upload_path = self._upload_path(job_id, filename)
+        with open(upload_path, "wb") as f:
+            shutil.copyfileobj(file, f, COPY_BUFFER_SIZE)
+        return self.job_repo.create(job_id, source or filename, filename, upload_path)
+    
+    def submit_text(self, content: str, source: str) -> IndexJob:
+        """Spool raw text to disk and queue it for indexing.
+        
+        Args:
+            content: Text content.
+            source: Source name to index under.
+            
+        Returns:
+            The queued IndexJob object.
+        """
+        job_id = generate_uuid()
+        # Raw text always goes through the text loader, whatever the source name
+        filename = "content.txt"
+        upload_path = self._upload_path(job_id, filename)
+        with open(upload_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return self.job_repo.create(job_id, source, filename, upload_path)
+    
+    def get_job(self, job_id: str) -> IndexJob | None:
+        """Get a job by its ID.
+        
+        Args:
+            job_id: The job's UUID.
+            
+        Returns:
+            The IndexJob object if found, None otherwise.
+        """
+        return self.job_repo.get_by_id(job_id)
+    
+    def _upload_path(self, job_id: str, filename: str) -> str:
+        """Path of the spooled upload for a job (keeps the file extension)."""
+        os.makedirs(self.upload_dir, exist_ok=True)
+        return os.path.join(self.upload_dir, job_id + os.path.splitext(filename)[1])
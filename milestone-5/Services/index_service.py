@@ -1,38 +1,382 @@
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterable, Iterator
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
-from Utils.file_loader import load_file
-from Models.document_model import DocumentModel
+from Utils.file_loader import iter_file
+from Services.model_registry import ModelRegistry
+from Utils.id_generator import generate_chunk_id, hash_content
+from Utils.minhash import minhash, jaccard
+from VectorStores import generation_dir
+from Config import settings
+
+
+@dataclass
+class PendingChunk:
+    """A new chunk waiting in an index batch.
+    
+    Attributes:
+        source: Document source name.
+        chunk_id: Deterministic chunk ID.
+        chunk: Chunk text and metadata.
+        content_hash: Hash of the chunk text.
+        signature: MinHash signature (None if deduplication is disabled).
+        duplicate_of: ID of the stored near-duplicate this chunk is linked to
+            instead of being stored (None to store it).
+    """
+    source: str
+    chunk_id: str
+    chunk: Document
+    content_hash: str
+    signature: np.ndarray | None = None
+    duplicate_of: str | None = None
 
 
 class IndexService:
-    """Service for indexing documents into ChromaDB."""
+    """Service for indexing documents into the vector store."""
     
-    def __init__(self, embed_model: str = "BAAI/bge-base-en-v1.5"):
-        self.embeddings = HuggingFaceEmbeddings(model_name=embed_model)
+    def __init__(self, registry: ModelRegistry, embed_model: str = "BAAI/bge-base-en-v1.5"):
+        self.registry = registry
+        self.embed_model = embed_model
+        self.embeddings = self.registry.get_embedding_engine(embed_model)
+        # Flush enough new chunks per batch to keep every embedding worker busy
+        self.batch_size = max(settings.INDEX_BATCH_SIZE, self.embeddings.preferred_batch_size)
+        # Minimum shingle similarity treated as a near-duplicate (None disables deduplication)
+        self.dedup_threshold = settings.DEDUP_THRESHOLD if settings.DEDUP_ENABLED else None
         self.splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        self.persist_dir = "milestone-5/storage/chroma_db"
-    
-    def index_text(self, content: str, source: str) -> int:
-        """Index raw text content."""
-        doc = DocumentModel(page_content=content, metadata={"source": source})
-        documents = [doc.to_langchain_document()]
-        return self._process_and_store(documents)
-    
-    def index_file(self, file_bytes: bytes, filename: str) -> int:
-        """Index uploaded file."""
-        documents = load_file(file_bytes, filename)  # Use util
-        return self._process_and_store(documents)
-    
-    def _process_and_store(self, documents: list[Document]) -> int:
-        """Split documents and store in ChromaDB."""
-        chunks = self.splitter.split_documents(documents)
-        
-        Chroma.from_documents(
-            documents=chunks,
-            embedding=self.embeddings,
-            persist_directory=self.persist_dir
-        )
-        
-        return len(chunks)
\ No newline at end of file
+        self.storage_dir = "milestone-5/storage"
+        # Generation to write (None writes to the active generation, see VectorStores.generations)
+        self.generation = None
+        self.index_dir = None
+    
+    def index_file(self, file: BinaryIO, filename: str, source: str = None,
+                   progress: Callable[[int], None] = None) -> dict:
+        """Index uploaded file, under its filename unless another source name is given.
+        
+        Pages are loaded, split, embedded and stored as a stream; progress,
+        if given, is called with the number of chunks processed so far.
+        """
+        documents = iter_file(file, filename, source, self.registry.get_pdf_executor())  # Use util
+        return self._process_and_store(documents, source or filename, progress)
+    
+    def delete_source(self, source: str) -> int:
+        """Remove every chunk of a source from the vector store and keyword index.
+        
+        Uses the manifest's source index, so the cost is proportional to the
+        number of chunks of that source.
+        
+        Returns:
+            Number of chunks removed (0 if the source is not indexed).
+        """
+        return self._sync_source(source, [])["removed"]
+    
+    def _process_and_store(self, documents: Iterable[Document], source: str,
+                           progress: Callable[[int], None] = None) -> dict:
+        """Split documents and sync their chunks into the vector store and keyword index.
+        
+        Chunk IDs are derived from the source and a hash of the chunk text,
+        so only chunks missing from the manifest are embedded and written.
+        New chunks whose word shingles are at least DEDUP_THRESHOLD similar
+        (MinHash estimate of Jaccard similarity) to a stored chunk are linked
+        to it instead of being embedded and stored.
+        Chunks of an earlier version of the source that no longer occur are
+        removed.
+        
+        Returns:
+            Dict with chunks (total), embedded (new or changed), deduplicated
+            (linked to a near-duplicate) and removed counts.
+        """
+        return self._sync_source(source, self._iter_chunks(documents, source), progress)
+    
+    def _iter_chunks(self, documents: Iterable[Document], source: str) -> Iterator[tuple[str, Document, str]]:
+        """Split documents lazily, one document (page) at a time.
+        
+        Yields:
+            (chunk ID, chunk, content hash) tuples.
+        """
+        for document in documents:
+            for chunk in self.splitter.split_documents([document]):
+                content_hash = hash_content(chunk.page_content)
+                yield generate_chunk_id(source, content_hash), chunk, content_hash
+    
+    def index_files(self, files: Iterable[tuple[str, str, Callable[[], BinaryIO]]],
+                    on_complete: Callable[[str, dict], None] = None,
+                    on_error: Callable[[str, Exception], None] = None) -> dict:
+        """Index many files, batching embeddings across file boundaries.
+        
+        New chunks from consecutive files share embedding batches, so
+        small files do not each pay for a partly filled embedding call. A
+        file counts as complete only once all of its chunks are written.
+        The index write lock is released between files once the pending
+        batch is written, and the batch is written early after the lock was
+        held for INDEX_LOCK_HOLD_SECONDS, so other writers (API uploads and
+        deletes) are not blocked for the whole run.
+        
+        Args:
+            files: (source, filename, open) tuples; open returns a binary file object.
+            on_complete: Called with (source, result) once a file is fully stored.
+            on_error: Called with (source, error) for a file that fails to load;
+                the file is skipped. Without it the error is raised.
+        
+        Returns:
+            Dict with files, failed, chunks, embedded, deduplicated and removed totals.
+        """
+        totals = {"files": 0, "failed": 0, "chunks": 0, "embedded": 0, "deduplicated": 0, "removed": 0}
+        batch = []
+        written = []
+        
+        def flush() -> None:
+            self._store_batch(batch)
+            batch.clear()
+            for source, result in written:
+                if on_complete:
+                    on_complete(source, result)
+            written.clear()
+        
+        self.index_dir = self._resolve_index_dir()
+        executor = self.registry.get_pdf_executor()
+        lock = ExitStack()
+        locked_at = None
+        changed = False
+        
+        def release() -> None:
+            nonlocal locked_at, changed
+            if changed:
+                self.registry.mark_index_written(self.index_dir)
+            lock.close()
+            locked_at = None
+            changed = False
+        
+        try:
+            for source, filename, open_file in files:
+                if locked_at is None:
+                    lock.enter_context(self.registry.index_write_lock(self.index_dir))
+                    locked_at = time.monotonic()
+                try:
+                    with open_file() as f:
+                        documents = iter_file(f, filename, source, executor)
+                        result = self._diff_source(source, self._iter_chunks(documents, source), batch, flush)
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(source, e)
+                    totals["failed"] += 1
+                else:
+                    written.append((source, result))
+                    totals["files"] += 1
+                    for key in ("chunks", "embedded", "deduplicated", "removed"):
+                        totals[key] += result[key]
+                    changed = changed or bool(result["embedded"] or result["removed"])
+                
+                # Let other writers in between files once the pending batch is written
+                if batch and time.monotonic() - locked_at >= settings.INDEX_LOCK_HOLD_SECONDS:
+                    flush()
+                if not batch:
+                    release()
+            if batch:
+                flush()
+        finally:
+            if locked_at is not None:
+                release()
+        
+        return totals
+    
+    def _sync_source(self, source: str, chunks: Iterable[tuple[str, Document, str]],
+                     progress: Callable[[int], None] = None) -> dict:
+        """Make the stored chunks of a source match the given chunks.
+        
+        New chunks are embedded and written in batches of batch_size
+        (INDEX_BATCH_SIZE, raised to keep every embedding worker busy) as
+        they arrive, so memory is bounded by the batch size rather than the
+        document size.
+        
+        Args:
+            source: Document source name.
+            chunks: (chunk ID, chunk, content hash) tuples; empty to delete the source.
+            progress: Called with the number of chunks processed every batch.
+        
+        Returns:
+            Dict with chunks (total), embedded (new or changed), deduplicated
+            and removed counts.
+        """
+        self.index_dir = self._resolve_index_dir()
+        with self.registry.index_write_lock(self.index_dir):
+            batch = []
+            
+            def flush() -> None:
+                self._store_batch(batch)
+                batch.clear()
+            
+            result = self._diff_source(source, chunks, batch, flush, progress)
+            flush()
+            
+            if result["embedded"] or result["removed"]:
+                self.registry.mark_index_written(self.index_dir)
+        
+        return result
+    
+    def _resolve_index_dir(self) -> str:
+        """Get the directory to write: the chosen generation, or the active one."""
+        if self.generation is not None:
+            return generation_dir(self.storage_dir, self.generation)
+        return self.registry.get_index_dir(self.storage_dir)
+    
+    def _diff_source(self, source: str, chunks: Iterable[tuple[str, Document, str]], batch: list[PendingChunk],
+                     flush: Callable[[], None], progress: Callable[[int], None] = None) -> dict:
+        """Queue a source's new chunks for writing and delete its stale ones (caller holds the index lock).
+        
+        Args:
+            source: Document source name.
+            chunks: (chunk ID, chunk, content hash) tuples.
+            batch: Pending chunks, shared across sources.
+            flush: Writes and clears the batch; called whenever it is full.
+            progress: Called with the number of chunks processed every batch.
+        
+        Returns:
+            Dict with chunks (total), embedded (new or changed), deduplicated
+            and removed counts.
+        """
+        manifest = self.registry.get_chunk_manifest(self.index_dir)
+        stored = manifest.source_chunks(source)
+        linked = manifest.source_duplicates(source)
+        seen = set()
+        embedded = 0
+        deduplicated = 0
+        
+        for chunk_id, chunk, content_hash in chunks:
+            # Identical text repeated within a source is stored once
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+            if chunk_id not in stored and chunk_id not in linked:
+                pending = PendingChunk(source, chunk_id, chunk, content_hash)
+                if self.dedup_threshold is not None:
+                    pending.signature = minhash(chunk.page_content)
+                    pending.duplicate_of = self._find_near_duplicate(pending.signature, batch)
+                batch.append(pending)
+                if pending.duplicate_of:
+                    deduplicated += 1
+                else:
+                    embedded += 1
+            if len(batch) >= self.batch_size:
+                flush()
+            if progress and len(seen) % self.batch_size == 0:
+                progress(len(seen))
+        
+        stale_ids = [chunk_id for chunk_id in stored if chunk_id not in seen]
+        stale_links = [chunk_id for chunk_id in linked if chunk_id not in seen]
+        if stale_ids:
+            self.registry.get_store(self.index_dir).delete(stale_ids)
+            self.registry.get_keyword_index(self.index_dir).delete(stale_ids)
+        if stale_ids or stale_links:
+            manifest.delete(stale_ids + stale_links)
+        if stale_ids:
+            for pending in self._promote_duplicates(stale_ids, batch):
+                if pending.source == source:
+                    deduplicated -= 1
+                    embedded += 1
+        
+        return {
+            "chunks": len(seen),
+            "embedded": embedded,
+            "deduplicated": deduplicated,
+            "removed": len(stale_ids) + len(stale_links)
+        }
+    
+    def _find_near_duplicate(self, signature: np.ndarray, batch: list[PendingChunk]) -> str | None:
+        """Find a pending or stored chunk at least dedup_threshold similar to a new chunk."""
+        for pending in batch:
+            if (pending.duplicate_of is None and pending.signature is not None
+                    and jaccard(pending.signature, signature) >= self.dedup_threshold):
+                return pending.chunk_id
+        return self.registry.get_chunk_manifest(self.index_dir).find_near_duplicate(signature, self.dedup_threshold)
+    
+    def _promote_duplicates(self, removed_ids: list[str], batch: list[PendingChunk]) -> list[PendingChunk]:
+        """Store one linked duplicate in place of each removed chunk and relink the others to it.
+        
+        Keeps text that other chunks share with a removed chunk searchable.
+        Pending duplicates are preferred, since they are being written anyway.
+        
+        Returns:
+            The pending chunks that were linked to a removed chunk and are now stored.
+        """
+        removed = set(removed_ids)
+        promoted = {}
+        stored = []
+        for pending in batch:
+            removed_id = pending.duplicate_of
+            if removed_id not in removed:
+                continue
+            if removed_id in promoted:
+                pending.duplicate_of = promoted[removed_id]
+            else:
+                promoted[removed_id] = pending.chunk_id
+                pending.duplicate_of = None
+                stored.append(pending)
+        
+        manifest = self.registry.get_chunk_manifest(self.index_dir)
+        for chunk_id, source, content_hash, duplicate_of, text, metadata in manifest.duplicates_of(removed_ids):
+            if duplicate_of not in promoted:
+                promoted[duplicate_of] = chunk_id
+                batch.append(PendingChunk(
+                    source, chunk_id, Document(page_content=text, metadata=metadata), content_hash,
+                    signature=minhash(text) if self.dedup_threshold is not None else None
+                ))
+        for removed_id, chunk_id in promoted.items():
+            manifest.relink(removed_id, chunk_id)
+        return stored
+    
+    def _store_batch(self, batch: list[PendingChunk]) -> None:
+        """Embed one batch of new chunks (cache misses only) and write it to the store, keyword index and manifest.
+        
+        Near-duplicates are only recorded in the manifest, linked to their stored chunk.
+        """
+        new = [pending for pending in batch if pending.duplicate_of is None]
+        if new:
+            ids = [pending.chunk_id for pending in new]
+            texts = [pending.chunk.page_content for pending in new]
+            self.registry.get_store(self.index_dir).add(
+                ids=ids,
+                texts=texts,
+                metadatas=[pending.chunk.metadata for pending in new],
+                embeddings=self._embed(texts, [pending.content_hash for pending in new])
+            )
+            self.registry.get_keyword_index(self.index_dir).add(ids, texts)
+        
+        by_source = {}
+        for pending in batch:
+            chunks, signatures, duplicates = by_source.setdefault(pending.source, ({}, {}, []))
+            if pending.duplicate_of is None:
+                chunks[pending.chunk_id] = pending.content_hash
+                if pending.signature is not None:
+                    signatures[pending.chunk_id] = pending.signature
+            else:
+                duplicates.append((pending.chunk_id, pending.content_hash, pending.duplicate_of,
+                                   pending.chunk.page_content, pending.chunk.metadata))
+        manifest = self.registry.get_chunk_manifest(self.index_dir)
+        for source, (chunks, signatures, duplicates) in by_source.items():
+            if chunks:
+                manifest.add(source, chunks, signatures)
+            if duplicates:
+                manifest.add_duplicates(source, duplicates)
+    
+    def _embed(self, texts: list[str], content_hashes: list[str]) -> list[list[float]]:
+        """Embed chunk texts, reusing vectors from the persistent embedding cache.
+        
+        Only texts whose (model, content hash) is not cached are sent to the
+        embedding engine; their vectors are then added to the cache.
+        """
+        cache = self.registry.get_embedding_cache()
+        if cache is None:
+            return self.embeddings.embed_documents(texts)
+        
+        vectors = cache.get_many(self.embed_model, content_hashes)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = self.embeddings.embed_documents([texts[i] for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+            cache.put_many(self.embed_model, {content_hashes[i]: vectors[i] for i in missing})
+        return vectors
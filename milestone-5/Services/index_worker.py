@@ -0,0 +1,148 @@
+"""Background worker for the index job queue.
+
+This module provides the IndexWorker class, a pool of threads that claim
+queued IndexJob rows and run them through IndexService, so indexing never
+runs inside an HTTP request.
+"""
+
+import os
+import socket
+import threading
+from fastapi import Request
+from Database import SessionLocal
+from Repositories import IndexJobRepository
+from Services.index_service import IndexService
+from Services.model_registry import ModelRegistry
+from Config import settings
+
+
+class IndexWorker:
+    """Thread pool that processes queued index jobs.
+    
+    A running job is leased to the thread running it, which renews the lease
+    with heartbeats. A job whose lease expired (its process died) is claimed
+    again by any worker; jobs of live workers, in this or another process,
+    are never taken over.
+    
+    Attributes:
+        registry: Shared model registry.
+        workers: Number of worker threads.
+    """
+    
+    def __init__(self, registry: ModelRegistry, workers: int = None) -> None:
+        """Initialize the worker.
+        
+        Args:
+            registry: Shared model registry.
+            workers: Number of worker threads (defaults to INDEX_WORKERS).
+        """
+        self.registry = registry
+        self.workers = workers or settings.INDEX_WORKERS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+    
+    def start(self) -> None:
+        """Requeue jobs whose worker is gone and start the threads."""
+        db = SessionLocal()
+        try:
+            IndexJobRepository(db).requeue_expired(settings.INDEX_JOB_LEASE_SECONDS)
+        finally:
+            db.close()
+        
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"index-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def notify(self) -> None:
+        """Wake idle workers after a job was submitted."""
+        self._wake.set()
+    
+    def stop(self, timeout: float = 5) -> None:
+        """Stop the threads; a job still running is reclaimed once its lease expires.
+        
+        Args:
+            timeout: Seconds to wait for each thread.
+        """
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+    
+    def _run(self) -> None:
+        """Worker loop: run jobs until the queue is empty, then wait."""
+        while not self._stop.is_set():
+            self._wake.clear()
+            if not self._run_next():
+                self._wake.wait(settings.INDEX_JOB_POLL_SECONDS)
+    
+    def _run_next(self) -> bool:
+        """Claim and run the oldest claimable job.
+        
+        Returns:
+            True if a job was run, False if nothing was claimable.
+        """
+        worker_id = f"{self.worker_id}:{threading.current_thread().name}"
+        db = SessionLocal()
+        try:
+            job_repo = IndexJobRepository(db)
+            job = job_repo.claim_next(worker_id, settings.INDEX_JOB_LEASE_SECONDS)
+            if job is None:
+                return False
+            
+            job_id, upload_path = job.job_id, job.upload_path
+            done = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat, args=(job_id, worker_id, done), name=f"{worker_id}-heartbeat", daemon=True
+            )
+            heartbeat.start()
+            try:
+                with open(upload_path, "rb") as f:
+                    result = IndexService(self.registry).index_file(
+                        f, job.filename, job.source,
+                        progress=lambda chunks: job_repo.update_progress(job_id, worker_id, chunks)
+                    )
+            except Exception as e:
+                db.rollback()
+                owned = job_repo.mark_failed(job_id, worker_id, str(e))
+            else:
+                owned = job_repo.mark_completed(
+                    job_id, worker_id,
+                    result["chunks"], result["embedded"], result["deduplicated"], result["removed"]
+                )
+            finally:
+                done.set()
+                heartbeat.join()
+            
+            # A reclaimed job belongs to its new worker, which still needs the upload
+            if owned and os.path.exists(upload_path):
+                os.remove(upload_path)
+            return True
+        finally:
+            db.close()
+    
+    def _heartbeat(self, job_id: str, worker_id: str, done: threading.Event) -> None:
+        """Renew the lease on a running job until it is done.
+        
+        Args:
+            job_id: The job's UUID.
+            worker_id: ID of the worker thread running the job.
+            done: Set once the job finished.
+        """
+        while not done.wait(settings.INDEX_JOB_HEARTBEAT_SECONDS):
+            db = SessionLocal()
+            try:
+                if not IndexJobRepository(db).heartbeat(job_id, worker_id):
+                    return
+            except Exception:
+                db.rollback()
+            finally:
+                db.close()
+
+
+def get_index_worker(request: Request) -> IndexWorker:
+    """Dependency for FastAPI to get the background index worker."""
+    return request.app.state.index_worker
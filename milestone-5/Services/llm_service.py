@@ -1,22 +1,21 @@
 """LLM Service for generating responses using Ollama."""
 
-from langchain_ollama import ChatOllama
+from typing import AsyncIterator
 from Config import settings
+from Services.model_registry import ModelRegistry
 
 
 class LLMService:
     """Service for interacting with Ollama LLM."""
     
-    def __init__(self, model_name: str = None):
+    def __init__(self, registry: ModelRegistry, model_name: str = None):
         """Initialize the LLM service."""
+        self.registry = registry
         model = model_name or settings.LLM_MODEL
-        self.llm = ChatOllama(
-            model=model,
-            temperature=settings.LLM_TEMPERATURE
-        )
+        self.llm = self.registry.get_llm(model, settings.LLM_TEMPERATURE)
     
-    def generate(self, query: str, context: list[str]) -> str:
-        """Generate a response using context.
+    async def agenerate(self, query: str, context: list[str]) -> str:
+        """Generate a response using context with the async Ollama client.
         
         Args:
             query: User's question.
@@ -25,6 +24,33 @@ class LLMService:
         Returns:
             LLM generated answer.
         """
+        response = await self.llm.ainvoke(self._build_prompt(query, context))
+        return response.content
+    
+    async def astream(self, query: str, context: list[str]) -> AsyncIterator[str]:
+        """Generate a response using context, yielding tokens from the async Ollama client.
+        
+        Args:
+            query: User's question.
+            context: Chat history and retrieved documents.
+        
+        Yields:
+            Pieces of the LLM generated answer.
+        """
+        async for chunk in self.llm.astream(self._build_prompt(query, context)):
+            if chunk.content:
+                yield chunk.content
+    
+    def _build_prompt(self, query: str, context: list[str]) -> str:
+        """Render the RAG prompt from the query and context.
+        
+        Args:
+            query: User's question.
+            context: Chat history and retrieved documents.
+        
+        Returns:
+            The prompt text.
+        """
         context_text = "\n".join(context) if context else ""
         print(context_text)
         
@@ -40,8 +66,7 @@ Use the information below to answer the question:
 Question: {query}
 Answer:"""
         
-        response = self.llm.invoke(prompt)
-        return response.content
+        return prompt
     
     def generate_summary(self, conversation: str, existing_summary: str = None) -> str:
         """Generate a summary of conversation.
@@ -69,3 +94,22 @@ Summary:"""
         
         response = self.llm.invoke(prompt)
         return response.content
+    
+    def combine_summaries(self, summaries: list[str]) -> str:
+        """Combine consecutive conversation summaries into one.
+        
+        Args:
+            summaries: Summaries of consecutive parts of a conversation, oldest first.
+        
+        Returns:
+            Concise summary covering all of them.
+        """
+        parts = "\n".join(f"{i}. {summary}" for i, summary in enumerate(summaries, 1))
+        prompt = f"""Combine these summaries of consecutive parts of a conversation, in order:
+
+{parts}
+
+Combined summary (3 sentences):"""
+        
+        response = self.llm.invoke(prompt)
+        return response.content
@@ -0,0 +1,156 @@
+"""Memory service for long-term recall of summarized chat messages.
+
+This module provides the MemoryService class, which embeds messages as they
+are summarized out of the active history and recalls the ones relevant to a
+new user message, so earlier facts stay available to the model without
+keeping them in every prompt. Embeddings are stored in Postgres and searched
+through a per-session NumpyVectorStore kept in sync with them.
+"""
+
+import os
+import numpy as np
+from sqlalchemy.orm import Session
+from Models.message_model import Message
+from Repositories import MessageRepository, MessageEmbeddingRepository
+from Services.model_registry import ModelRegistry
+from VectorStores import NumpyVectorStore, write_lock
+from Config import settings
+
+# Message IDs per query when syncing a recall index
+SYNC_BATCH = 500
+
+
+class MemoryService:
+    """Per-session semantic memory over summarized messages.
+    
+    Attributes:
+        db: SQLAlchemy database session.
+        registry: Shared model registry.
+        embed_model: Embedding model name (the retrieval model, so query
+            embeddings from retrieval can be reused).
+        message_repo: Repository for message operations.
+        embedding_repo: Repository for message embeddings.
+    """
+    
+    def __init__(self, db: Session, registry: ModelRegistry,
+                 embed_model: str = "BAAI/bge-base-en-v1.5") -> None:
+        """Initialize the memory service.
+        
+        Args:
+            db: SQLAlchemy database session.
+            registry: Shared model registry.
+            embed_model: Embedding model name.
+        """
+        self.db = db
+        self.registry = registry
+        self.embed_model = embed_model
+        self.message_repo = MessageRepository(db)
+        self.embedding_repo = MessageEmbeddingRepository(db)
+    
+    def embed(self, texts: list[str]) -> list[bytes]:
+        """Embed message texts for remember, without touching the database.
+        
+        Args:
+            texts: Message contents.
+        
+        Returns:
+            float32 vector bytes, one per text.
+        """
+        if not texts:
+            return []
+        embeddings = self.registry.get_embeddings(self.embed_model)
+        return [np.asarray(vector, dtype=np.float32).tobytes() for vector in embeddings.embed_documents(texts)]
+    
+    def remember(self, session_id: str, messages: list[Message], commit: bool = True,
+                 vectors: list[bytes] = None) -> None:
+        """Embed messages into the session's memory.
+        
+        Args:
+            session_id: The session's UUID.
+            messages: Messages leaving the active history.
+            commit: Commit the change (False leaves it to the caller's transaction).
+            vectors: Embeddings from embed, so a caller can embed outside its
+                transaction (computed here if omitted).
+        """
+        if not messages:
+            return
+        if vectors is None:
+            vectors = self.embed([msg.content for msg in messages])
+        self.embedding_repo.create_many(
+            session_id,
+            self.embed_model,
+            {msg.message_id: vector for msg, vector in zip(messages, vectors)},
+            commit=commit
+        )
+    
+    def recall(self, session_id: str, embedding: list[float], top_k: int = None) -> list[Message]:
+        """Find the summarized messages most similar to a query.
+        
+        Searches the session's recall index (see _open_index), so every
+        summarized message can be recalled while a turn never loads the
+        session's embeddings. Below MEMORY_IVF_THRESHOLD messages the index
+        is scanned exactly; above it, only NUMPY_IVF_NPROBE of its IVF lists
+        (about sqrt(n) vectors each) are scanned.
+        
+        Args:
+            session_id: The session's UUID.
+            embedding: Query embedding (from the same model).
+            top_k: Maximum number of messages (defaults to MEMORY_TOP_K).
+        
+        Returns:
+            Messages with cosine similarity of at least MEMORY_MIN_SIMILARITY,
+            oldest first.
+        """
+        top_k = top_k or settings.MEMORY_TOP_K
+        if embedding is None:
+            return []
+        count = self.embedding_repo.count_by_session(session_id, self.embed_model)
+        if not count:
+            return []
+        
+        index_dir = os.path.join(settings.MEMORY_INDEX_DIR, session_id, self.embed_model.replace("/", "--"))
+        with write_lock(index_dir):
+            store = self._open_index(session_id, index_dir, count)
+            hits = store.search([embedding], top_k)[0]
+        
+        # The store scores by squared L2 distance of unit vectors: 2 - 2 * cosine
+        recalled = [int(hit["id"]) for hit in hits if 1 - hit["score"] / 2 >= settings.MEMORY_MIN_SIMILARITY]
+        return self.message_repo.get_by_ids(recalled) if recalled else []
+    
+    def _open_index(self, session_id: str, index_dir: str, count: int) -> NumpyVectorStore:
+        """Open a session's recall index, adding embeddings it is missing (caller holds its write lock).
+        
+        The message_embeddings table stays the source of truth: the index
+        is a NumpyVectorStore under MEMORY_INDEX_DIR, opened from disk on
+        every recall so writes by other processes are always seen, and
+        synced whenever its size differs from the table's.
+        
+        Args:
+            session_id: The session's UUID.
+            index_dir: The session's index directory.
+            count: Number of the session's embeddings in the table.
+        
+        Returns:
+            The synced store.
+        """
+        store = NumpyVectorStore(
+            index_dir, ivf_threshold=settings.MEMORY_IVF_THRESHOLD, nprobe=settings.NUMPY_IVF_NPROBE
+        )
+        if store.count() == count:
+            return store
+        
+        message_ids = self.embedding_repo.get_message_ids(session_id, self.embed_model)
+        indexed = set()
+        for start in range(0, len(message_ids), SYNC_BATCH):
+            batch = [str(message_id) for message_id in message_ids[start:start + SYNC_BATCH]]
+            indexed.update(int(record["id"]) for record in store.get(batch))
+        missing = [message_id for message_id in message_ids if message_id not in indexed]
+        for start in range(0, len(missing), SYNC_BATCH):
+            rows = self.embedding_repo.get_by_ids(missing[start:start + SYNC_BATCH], self.embed_model)
+            store.add(
+                ids=[str(message_id) for message_id, _ in rows],
+                texts=[""] * len(rows),
+                metadatas=[{}] * len(rows),
+                embeddings=np.frombuffer(b"".join(vector for _, vector in rows), dtype=np.float32).reshape(len(rows), -1)
+            )
+        return store
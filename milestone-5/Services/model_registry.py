@@ -0,0 +1,378 @@
+"""Process-wide registry for expensive model and vector-store clients.
+
+This module provides the ModelRegistry class, which owns one embedding model,
+one vector store per storage directory and one ChatOllama client per model so
+they are loaded once at startup instead of on every request. It also owns the
+executors that async request handlers offload blocking work to, and tracks the
+active index generation so every worker process follows rebuilds and other
+processes' writes without a restart.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterator
+from fastapi import Request
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_ollama import ChatOllama
+from Config import settings
+from Utils.ttl_cache import TTLCache
+from Services.answer_cache import SemanticAnswerCache
+from Services.embedding_engine import EmbeddingEngine
+from VectorStores import (
+    VectorStore, KeywordIndex, ChunkManifest, EmbeddingCache, create_vector_store,
+    active_generation, generation_dir, mark_written, read_stamp, write_lock
+)
+
+
+class ModelRegistry:
+    """Shared, lazily-populated cache of model and vector-store clients.
+    
+    Attributes:
+        embeddings: Loaded embedding models keyed by model name.
+        embedding_engines: Document embedding engines keyed by model name.
+        stores: Open vector stores keyed by storage directory.
+        keyword_indexes: Open BM25 keyword indexes keyed by storage directory.
+        chunk_manifests: Open chunk manifests keyed by storage directory.
+        embedding_cache: Persistent chunk embedding cache (opened on first use).
+        index_locks: Locks serializing this process's index writes, keyed by index directory.
+        index_dirs: Active index generation directory keyed by storage directory.
+        index_stamps: Last seen write stamp keyed by index directory.
+        llms: ChatOllama clients keyed by (model name, temperature).
+        query_embedding_cache: Query embeddings keyed by (model name, normalized query).
+        answer_cache: Semantic cache of /ask answers.
+        index_generation: Counter bumped whenever indexed content changes.
+        embedding_executor: Threads that run embedding model calls.
+        store_executor: Threads that run vector store and keyword index lookups.
+        db_executor: Threads that run blocking database calls.
+        pdf_executor: Processes that extract text from large PDFs (created on first use).
+    """
+    
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.embeddings: dict[str, HuggingFaceEmbeddings] = {}
+        self.embedding_engines: dict[str, EmbeddingEngine] = {}
+        self.stores: dict[str, VectorStore] = {}
+        self.keyword_indexes: dict[str, KeywordIndex] = {}
+        self.chunk_manifests: dict[str, ChunkManifest] = {}
+        self.embedding_cache: EmbeddingCache | None = None
+        self.index_locks: dict[str, threading.Lock] = {}
+        self.index_dirs: dict[str, str] = {}
+        self.index_stamps: dict[str, str | None] = {}
+        self._index_checked: dict[str, float] = {}
+        self.llms: dict[tuple[str, float], ChatOllama] = {}
+        self.query_embedding_cache = TTLCache(
+            max_size=settings.QUERY_CACHE_SIZE,
+            ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS
+        )
+        self.answer_cache = SemanticAnswerCache(
+            max_size=settings.ANSWER_CACHE_SIZE,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            threshold=settings.ANSWER_CACHE_THRESHOLD
+        )
+        self.index_generation = 0
+        self.embedding_executor = ThreadPoolExecutor(settings.EMBEDDING_WORKERS, thread_name_prefix="embedding")
+        self.store_executor = ThreadPoolExecutor(settings.VECTOR_STORE_WORKERS, thread_name_prefix="vector-store")
+        self.db_executor = ThreadPoolExecutor(settings.DB_WORKERS, thread_name_prefix="db")
+        self.pdf_executor: ProcessPoolExecutor | None = None
+        self._lock = threading.RLock()
+    
+    def get_embeddings(self, model_name: str) -> HuggingFaceEmbeddings:
+        """Get the embedding model, loading it on first use.
+        
+        Args:
+            model_name: HuggingFace model name.
+        
+        Returns:
+            The shared HuggingFaceEmbeddings instance.
+        """
+        with self._lock:
+            if model_name not in self.embeddings:
+                self.embeddings[model_name] = HuggingFaceEmbeddings(model_name=model_name)
+            return self.embeddings[model_name]
+    
+    def get_embedding_engine(self, model_name: str) -> EmbeddingEngine:
+        """Get the document embedding engine for a model, creating it on first use.
+        
+        Args:
+            model_name: HuggingFace model name.
+        
+        Returns:
+            The shared EmbeddingEngine configured from the EMBED_* settings.
+        """
+        with self._lock:
+            if model_name not in self.embedding_engines:
+                self.embedding_engines[model_name] = EmbeddingEngine(
+                    model_name,
+                    processes=settings.EMBED_PROCESSES,
+                    batch_size=settings.EMBED_BATCH_SIZE,
+                    threads_per_process=settings.EMBED_THREADS_PER_PROCESS,
+                    sort_by_length=settings.EMBED_SORT_BY_LENGTH,
+                    embeddings=None if settings.EMBED_PROCESSES > 0 else self.get_embeddings(model_name)
+                )
+            return self.embedding_engines[model_name]
+    
+    def get_index_dir(self, storage_dir: str) -> str:
+        """Get the directory of the active index generation, following swaps and foreign writes.
+        
+        The pointer and stamp files are read at most every
+        INDEX_RELOAD_CHECK_SECONDS. If another generation was activated, the
+        previous one is closed. If another process wrote to the active
+        generation, its vector store is reopened to load those writes. Both
+        invalidate cached answers.
+        
+        Args:
+            storage_dir: Root storage directory.
+        
+        Returns:
+            The index directory to pass to get_store, get_keyword_index and get_chunk_manifest.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if (storage_dir in self.index_dirs
+                    and now - self._index_checked[storage_dir] < settings.INDEX_RELOAD_CHECK_SECONDS):
+                return self.index_dirs[storage_dir]
+            self._index_checked[storage_dir] = now
+        
+        index_dir = generation_dir(storage_dir, active_generation(storage_dir))
+        stamp = read_stamp(index_dir)
+        with self._lock:
+            previous = self.index_dirs.get(storage_dir)
+            self.index_dirs[storage_dir] = index_dir
+            if previous is not None and previous != index_dir:
+                self._close_index(previous)
+                self.index_stamps[index_dir] = stamp
+                self.index_generation += 1
+            elif self.index_stamps.setdefault(index_dir, stamp) != stamp:
+                self.index_stamps[index_dir] = stamp
+                self._reopen_store(index_dir)
+                self.index_generation += 1
+            return index_dir
+    
+    def mark_index_written(self, index_dir: str) -> int:
+        """Record that this process changed an index, so other processes reload it.
+        
+        The caller holds index_write_lock, which already loaded other
+        processes' earlier writes.
+        
+        Args:
+            index_dir: Index directory that was written.
+        
+        Returns:
+            The new index generation.
+        """
+        with self._lock:
+            self.index_stamps[index_dir] = mark_written(index_dir)
+        return self.bump_index_generation()
+    
+    def get_store(self, storage_dir: str) -> VectorStore:
+        """Get the vector store for a storage directory, opening it on first use.
+        
+        Args:
+            storage_dir: Index directory (see get_index_dir).
+        
+        Returns:
+            The shared VectorStore of the configured backend.
+        """
+        with self._lock:
+            if storage_dir not in self.stores:
+                self.stores[storage_dir] = create_vector_store(storage_dir)
+            return self.stores[storage_dir]
+    
+    def get_keyword_index(self, storage_dir: str) -> KeywordIndex:
+        """Get the BM25 keyword index for a storage directory, opening it on first use.
+        
+        Args:
+            storage_dir: Index directory (see get_index_dir).
+        
+        Returns:
+            The shared KeywordIndex.
+        """
+        with self._lock:
+            if storage_dir not in self.keyword_indexes:
+                os.makedirs(storage_dir, exist_ok=True)
+                self.keyword_indexes[storage_dir] = KeywordIndex(os.path.join(storage_dir, "keyword_index.sqlite3"))
+            return self.keyword_indexes[storage_dir]
+    
+    def get_chunk_manifest(self, storage_dir: str) -> ChunkManifest:
+        """Get the chunk manifest for a storage directory, opening it on first use.
+        
+        Args:
+            storage_dir: Index directory (see get_index_dir).
+        
+        Returns:
+            The shared ChunkManifest.
+        """
+        with self._lock:
+            if storage_dir not in self.chunk_manifests:
+                os.makedirs(storage_dir, exist_ok=True)
+                self.chunk_manifests[storage_dir] = ChunkManifest(os.path.join(storage_dir, "chunk_manifest.sqlite3"))
+            return self.chunk_manifests[storage_dir]
+    
+    def get_embedding_cache(self) -> EmbeddingCache | None:
+        """Get the persistent chunk embedding cache, opening it on first use.
+        
+        The cache lives outside the index storage directories so it survives
+        store rebuilds.
+        
+        Returns:
+            The shared EmbeddingCache, or None if EMBEDDING_CACHE_MAX_MB is 0.
+        """
+        if settings.EMBEDDING_CACHE_MAX_MB <= 0:
+            return None
+        with self._lock:
+            if self.embedding_cache is None:
+                os.makedirs(os.path.dirname(settings.EMBEDDING_CACHE_PATH) or ".", exist_ok=True)
+                self.embedding_cache = EmbeddingCache(
+                    settings.EMBEDDING_CACHE_PATH,
+                    max_bytes=settings.EMBEDDING_CACHE_MAX_MB * 1024 * 1024
+                )
+            return self.embedding_cache
+    
+    @contextmanager
+    def index_write_lock(self, index_dir: str) -> Iterator[None]:
+        """Serialize index writes to an index directory across threads and processes.
+        
+        Threads of this process queue on a shared lock, then the holder takes
+        the directory's file lock, which other API workers and the bulk
+        indexer take as well. Once the lock is held, a vector store left
+        stale by another process's writes is reopened, so this process never
+        writes through an outdated in-memory copy.
+        
+        Args:
+            index_dir: Index directory (see get_index_dir).
+        """
+        with self._lock:
+            lock = self.index_locks.setdefault(index_dir, threading.Lock())
+        with lock, write_lock(index_dir):
+            with self._lock:
+                stamp = read_stamp(index_dir)
+                if self.index_stamps.get(index_dir) != stamp:
+                    self.index_stamps[index_dir] = stamp
+                    self._reopen_store(index_dir)
+                    self.index_generation += 1
+            yield
+    
+    def get_llm(self, model_name: str, temperature: float = None) -> ChatOllama:
+        """Get the ChatOllama client for a model, creating it on first use.
+        
+        Args:
+            model_name: Ollama model name.
+            temperature: Sampling temperature.
+        
+        Returns:
+            The shared ChatOllama instance.
+        """
+        key = (model_name, temperature)
+        with self._lock:
+            if key not in self.llms:
+                self.llms[key] = ChatOllama(model=model_name, temperature=temperature)
+            return self.llms[key]
+    
+    def bump_index_generation(self) -> int:
+        """Record that indexed content changed, invalidating cached answers.
+        
+        Returns:
+            The new index generation.
+        """
+        with self._lock:
+            self.index_generation += 1
+            return self.index_generation
+    
+    def get_pdf_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool for parallel PDF extraction, starting it on first use.
+        
+        Workers are spawned rather than forked because the server process is
+        multi-threaded.
+        
+        Returns:
+            The shared ProcessPoolExecutor.
+        """
+        with self._lock:
+            if self.pdf_executor is None:
+                self.pdf_executor = ProcessPoolExecutor(
+                    max_workers=settings.PDF_PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self.pdf_executor
+    
+    def _close_index(self, index_dir: str) -> None:
+        """Drop the cached store, keyword index and manifest of an index directory (caller holds the lock).
+        
+        Requests already holding them finish on the old objects.
+        """
+        self._reopen_store(index_dir)
+        self.keyword_indexes.pop(index_dir, None)
+        self.chunk_manifests.pop(index_dir, None)
+        self.index_stamps.pop(index_dir, None)
+    
+    def _reopen_store(self, index_dir: str) -> None:
+        """Close the cached vector store of an index directory so the next get_store reloads it (caller holds the lock)."""
+        store = self.stores.pop(index_dir, None)
+        if store is not None:
+            store.close()
+    
+    async def run_in(self, executor: Executor, func, *args, **kwargs):
+        """Run a blocking call on an executor without blocking the event loop.
+        
+        Args:
+            executor: One of the registry's executors.
+            func: Blocking callable.
+            *args: Positional arguments for func.
+            **kwargs: Keyword arguments for func.
+        
+        Returns:
+            The callable's return value.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    
+    def close(self) -> None:
+        """Drop all cached clients so their resources can be released."""
+        for executor in (self.embedding_executor, self.store_executor, self.db_executor, self.pdf_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for engine in self.embedding_engines.values():
+                engine.close()
+            self.embedding_engines.clear()
+            for store in self.stores.values():
+                store.close()
+            self.stores.clear()
+            self.keyword_indexes.clear()
+            self.chunk_manifests.clear()
+            self.index_dirs.clear()
+            self.index_stamps.clear()
+            self.embedding_cache = None
+            self.llms.clear()
+            self.embeddings.clear()
+            self.query_embedding_cache.clear()
+            self.answer_cache.clear()
+    
+    def stats(self) -> dict:
+        """Get statistics for the shared caches and open vector stores.
+        
+        Returns:
+            Dict of cache name to its statistics.
+        """
+        with self._lock:
+            stores = dict(self.stores)
+            engines = dict(self.embedding_engines)
+            embedding_cache = self.embedding_cache
+        return {
+            "query_embedding_cache": self.query_embedding_cache.stats(),
+            "answer_cache": self.answer_cache.stats(),
+            "vector_stores": {storage_dir: store.stats() for storage_dir, store in stores.items()},
+            "embedding_engines": {model_name: engine.stats() for model_name, engine in engines.items()},
+            "embedding_cache": embedding_cache.stats() if embedding_cache else None
+        }
+
+
+def get_registry(request: Request) -> ModelRegistry:
+    """Dependency for FastAPI to get the shared model registry."""
+    return request.app.state.registry
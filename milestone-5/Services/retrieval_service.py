@@ -1,43 +1,210 @@
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+import unicodedata
+from Services.model_registry import ModelRegistry
+from Models.retrieval_context import RetrievalContext
+from Config import settings
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize query text so trivially different queries share a cache key."""
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
 
 
 class RetrievalService:
-    """Service for searching indexed documents in ChromaDB."""
+    """Service for searching indexed documents in the vector store."""
     
-    def __init__(self, embed_model: str = "BAAI/bge-base-en-v1.5"):
-        self.embeddings = HuggingFaceEmbeddings(model_name=embed_model)
-        self.persist_dir = "milestone-5/storage/chroma_db"
+    def __init__(self, registry: ModelRegistry, embed_model: str = "BAAI/bge-base-en-v1.5"):
+        self.registry = registry
+        self.embed_model = embed_model
+        self.embeddings = self.registry.get_embeddings(embed_model)
+        self.storage_dir = "milestone-5/storage"
         self.vectorstore = None
+        self.keyword_index = None
     
     def load_store(self):
-        """Load ChromaDB from disk."""
-        self.vectorstore = Chroma(
-            persist_directory=self.persist_dir,
-            embedding_function=self.embeddings
-        )
+        """Load the active generation's vector store and keyword index from the shared registry."""
+        index_dir = self.registry.get_index_dir(self.storage_dir)
+        self.vectorstore = self.registry.get_store(index_dir)
+        self.keyword_index = self.registry.get_keyword_index(index_dir)
     
-    def search(self, query: str, top_k: int = 5) -> list[dict]:
-        """Search for relevant documents.
+    def embed_query(self, query: str) -> list[float]:
+        """Embed a query, reusing the cached embedding for repeat queries.
+        
+        The cache is keyed by model name and normalized text. Query
+        embeddings do not depend on the indexed documents, so index updates
+        never make a cached entry stale.
         
         Args:
             query: Search query text
-            top_k: Number of results to return
         
         Returns:
-            List of results with content, source, score
+            Query embedding vector
+        """
+        cache = self.registry.query_embedding_cache
+        key = (self.embed_model, _normalize_query(query))
+        embedding = cache.get(key)
+        if embedding is None:
+            embedding = self.embeddings.embed_query(query)
+            cache.set(key, tuple(embedding))
+            return embedding
+        return list(embedding)
+    
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed many queries, batching every cache miss into one model call.
+        
+        Args:
+            queries: Search query texts
+        
+        Returns:
+            Query embedding vectors, in input order
         """
-        if self.vectorstore is None:
-            self.load_store()
+        cache = self.registry.query_embedding_cache
+        keys = [(self.embed_model, _normalize_query(q)) for q in queries]
+        embeddings = [cache.get(key) for key in keys]
         
-        results = self.vectorstore.similarity_search_with_score(query, k=top_k)
+        missing = {}
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(keys[i], []).append(i)
+        
+        if missing:
+            texts = [queries[positions[0]] for positions in missing.values()]
+            for key, embedding in zip(missing, self.embeddings.embed_documents(texts)):
+                cache.set(key, tuple(embedding))
+                for i in missing[key]:
+                    embeddings[i] = embedding
+        
+        return [list(e) for e in embeddings]
+    
+    def search_by_vectors(self, embeddings: list[list[float]], top_ks: list[int]) -> list[list[dict]]:
+        """Search for many precomputed query embeddings in one vector lookup.
+        
+        Args:
+            embeddings: Query embedding vectors
+            top_ks: Number of results to return for each query
+        
+        Returns:
+            One list of results with id, content, source, score per query
+        """
+        if not embeddings:
+            return []
+        # Cheap between checks; picks up a new generation or other workers' writes
+        self.load_store()
+        
+        hits = self.vectorstore.search(embeddings, max(top_ks))
         
         output = []
-        for doc, score in results:
-            output.append({
-                "content": doc.page_content,
-                "source": doc.metadata.get("source", "unknown"),
-                "score": float(score)
-            })
+        for query_hits, top_k in zip(hits, top_ks):
+            output.append([
+                {
+                    "id": hit["id"],
+                    "content": hit["content"],
+                    "source": hit["metadata"].get("source", "unknown"),
+                    "score": hit["score"]
+                }
+                for hit in query_hits[:top_k]
+            ])
         return output
-
+    
+    def _retrieve(self, queries: list[str], top_ks: list[int], embeddings: list[list[float]],
+                  modes: list[str]) -> list[RetrievalContext]:
+        """Run one batched vector lookup, then fuse hybrid queries with BM25."""
+        # Hybrid queries fetch a deeper vector candidate list to fuse with BM25
+        depths = [
+            k * settings.HYBRID_CANDIDATE_MULTIPLIER if mode == "hybrid" else k
+            for k, mode in zip(top_ks, modes)
+        ]
+        vector_results = self.search_by_vectors(embeddings, depths)
+        
+        contexts = []
+        for query, top_k, embedding, mode, results, depth in zip(queries, top_ks, embeddings, modes, vector_results, depths):
+            if mode == "hybrid":
+                results = self._fuse(query, results, top_k, depth)
+            contexts.append(RetrievalContext(query=query, top_k=top_k, embedding=embedding, results=results))
+        return contexts
+    
+    def _fuse(self, query: str, vector_results: list[dict], top_k: int, depth: int) -> list[dict]:
+        """Combine vector and BM25 rankings with reciprocal rank fusion.
+        
+        Args:
+            query: Search query text
+            vector_results: Vector hits, best first
+            top_k: Number of results to return
+            depth: Number of BM25 candidates to fuse
+        
+        Returns:
+            Fused results whose score is the RRF score (higher is better)
+        """
+        keyword_hits = self.keyword_index.search(query, depth)
+        
+        fused = {}
+        for ranking in ([r["id"] for r in vector_results], [chunk_id for chunk_id, _ in keyword_hits]):
+            for rank, chunk_id in enumerate(ranking):
+                fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (settings.HYBRID_RRF_K + rank + 1)
+        best = sorted(fused, key=fused.get, reverse=True)[:top_k]
+        
+        by_id = {r["id"]: r for r in vector_results}
+        for hit in self.vectorstore.get([chunk_id for chunk_id in best if chunk_id not in by_id]):
+            by_id[hit["id"]] = {
+                "id": hit["id"],
+                "content": hit["content"],
+                "source": hit["metadata"].get("source", "unknown")
+            }
+        return [{**by_id[chunk_id], "score": fused[chunk_id]} for chunk_id in best if chunk_id in by_id]
+    
+    async def aembed_query(self, query: str) -> list[float]:
+        """Embed a query on the embedding executor (see embed_query)."""
+        return await self.registry.run_in(self.registry.embedding_executor, self.embed_query, query)
+    
+    async def aretrieve(self, query: str, top_k: int = 5, embedding: list[float] = None,
+                        mode: str = "vector") -> RetrievalContext:
+        """Embed the query once and retrieve its relevant documents without blocking the event loop.
+        
+        Embedding runs on the embedding executor and the vector/BM25 lookups
+        on the vector store executor.
+        
+        Args:
+            query: Search query text
+            top_k: Number of results to return
+            embedding: Precomputed query embedding, if already available
+            mode: "vector" for similarity search, "hybrid" to fuse it with BM25
+        
+        Returns:
+            RetrievalContext carrying the embedding and results
+        """
+        if embedding is None:
+            embedding = await self.aembed_query(query)
+        contexts = await self.registry.run_in(
+            self.registry.store_executor, self._retrieve, [query], [top_k], [embedding], [mode]
+        )
+        return contexts[0]
+    
+    async def aretrieve_batch(self, queries: list[str], top_ks: list[int],
+                              modes: list[str] = None) -> list[RetrievalContext]:
+        """Embed and retrieve many queries together without blocking the event loop.
+        
+        Args:
+            queries: Search query texts
+            top_ks: Number of results to return for each query
+            modes: Retrieval mode for each query (defaults to "vector")
+        
+        Returns:
+            One RetrievalContext per query, in input order
+        """
+        modes = modes or ["vector"] * len(queries)
+        embeddings = await self.registry.run_in(self.registry.embedding_executor, self.embed_queries, queries)
+        return await self.registry.run_in(
+            self.registry.store_executor, self._retrieve, queries, top_ks, embeddings, modes
+        )
+    
+    async def asearch(self, query: str, top_k: int = 5, mode: str = "vector") -> list[dict]:
+        """Search for relevant documents without blocking the event loop.
+        
+        Args:
+            query: Search query text
+            top_k: Number of results to return
+            mode: "vector" for similarity search, "hybrid" to fuse it with BM25
+        
+        Returns:
+            List of results with content, source, score
+        """
+        return (await self.aretrieve(query, top_k, mode=mode)).results
@@ -3,12 +3,31 @@
 This module provides the SummaryService class for message summarization.
 """
 
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from Repositories import MessageRepository, SessionSummaryRepository
+from Repositories import MessageRepository, SessionSummaryRepository, SummaryNodeRepository
 from Services.llm_service import LLMService
+from Services.memory_service import MemoryService
+from Services.model_registry import ModelRegistry
 from Config import settings
 
 
+@dataclass
+class PlannedNode:
+    """A summary tree root while a run plans its roll-ups outside the database.
+    
+    Attributes:
+        level: Node level (0 for a chunk summary).
+        first_message_id: First message covered.
+        messages_count: Number of messages covered.
+        summary_text: The summary text.
+    """
+    level: int
+    first_message_id: int
+    messages_count: int
+    summary_text: str
+
+
 class SummaryService:
     """Service for summarizing old chat messages.
     
@@ -16,70 +35,237 @@ class SummaryService:
         db: SQLAlchemy database session.
         message_repo: Repository for message operations.
         summary_repo: Repository for summary operations.
+        node_repo: Repository for summary tree nodes.
         llm_service: Service for LLM generation.
+        memory_service: Service for long-term message memory.
     """
     
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, registry: ModelRegistry) -> None:
         """Initialize the summary service.
         
         Args:
             db: SQLAlchemy database session.
+            registry: Shared model registry.
         """
         self.db = db
         self.message_repo = MessageRepository(db)
         self.summary_repo = SessionSummaryRepository(db)
-        self.llm_service = LLMService()
+        self.node_repo = SummaryNodeRepository(db)
+        self.llm_service = LLMService(registry)
+        self.memory_service = MemoryService(db, registry)
+    
+    def should_summarize(self, active_count: int) -> bool:
+        """Check whether the active history reached the high watermark.
+        
+        The high watermark is MAX_HISTORY_MESSAGES + SUMMARY_BLOCK_SIZE and the
+        low watermark MAX_HISTORY_MESSAGES, so each summary call folds a block
+        of at least SUMMARY_BLOCK_SIZE messages and the next one is that many
+        turns away.
+        
+        Args:
+            active_count: Number of active messages in the session.
+            
+        Returns:
+            True if the oldest messages should be summarized.
+        """
+        return active_count >= settings.MAX_HISTORY_MESSAGES + max(settings.SUMMARY_BLOCK_SIZE, 1)
     
     def summarize_old_messages(self, session_id: str) -> None:
-        """Summarize old messages and mark them as inactive.
+        """Summarize old messages down to the low watermark and mark them as inactive.
+        
+        Does nothing until the high watermark is reached (see should_summarize).
+        The messages and summary tree are read in a short transaction, and
+        the LLM and embedding calls run with no transaction or lock held.
+        The results are then written in one transaction under a per-session
+        lock, after re-checking that the messages are still active and the
+        tree roots unchanged. A run that lost the race to another worker or
+        process discards its work, so every message is summarized exactly once.
         
         Args:
             session_id: The session's UUID.
         """
-        # Get active messages
+        # Read the block to summarize and the tree it extends, then end the transaction
         active_messages = self.message_repo.get_active(session_id)
-        
-        if len(active_messages) <= settings.MAX_HISTORY_MESSAGES:
+        if not self.should_summarize(len(active_messages)):
+            self.db.rollback()
             return
         
         # Get messages to summarize (keep recent ones active)
-        messages_to_summarize = active_messages[:-settings.MAX_HISTORY_MESSAGES]
+        messages_to_summarize = active_messages[:len(active_messages) - settings.MAX_HISTORY_MESSAGES]
+        message_ids = [msg.message_id for msg in messages_to_summarize]
+        contents = [msg.content for msg in messages_to_summarize]
+        conversation_text = "\n".join(f"{msg.role}: {msg.content}" for msg in messages_to_summarize)
+        roots = self.node_repo.get_roots(session_id)
+        root_ids = [node.node_id for node in roots]
+        planned = [
+            PlannedNode(node.level, node.first_message_id, node.messages_count, node.summary_text)
+            for node in roots
+        ]
+        existing_summary = self.summary_repo.get_by_session(session_id)
+        existing_text = existing_summary.summary_text if existing_summary else None
+        total_count = len(message_ids) + (existing_summary.messages_count if existing_summary else 0)
+        self.db.rollback()
         
-        # Build conversation text
-        conversation = []
-        for msg in messages_to_summarize:
-            conversation.append(f"{msg.role}: {msg.content}")
-        conversation_text = "\n".join(conversation)
+        # Summarize this block on its own as a chunk summary (level 0 node);
+        # older history is never rewritten, only rolled up
+        chunk_summary = self.llm_service.generate_summary(conversation=conversation_text)
+        planned.append(PlannedNode(0, message_ids[0], len(message_ids), chunk_summary))
+        segment_summaries, planned = self._plan_roll_up(planned)
+        vectors = self.memory_service.embed(contents) if settings.MEMORY_ENABLED else None
         
-        # Get existing summary
-        existing_summary = self.summary_repo.get_by_session(session_id)
-        existing_text = existing_summary.summary_text if existing_summary else ""
+        if existing_text is None:
+            session_text = chunk_summary
+        elif segment_summaries:
+            session_text = self._generate_session_summary(existing_text, planned, total_count)
+        else:
+            # Fold the new block in, so the session summary covers every message it counts
+            session_text = self.llm_service.combine_summaries([existing_text, chunk_summary])
         
-        # Generate new summary
-        new_summary = self._generate_summary(existing_text, conversation_text)
+        # Another worker is summarizing this session; its run covers these messages
+        if not self.summary_repo.try_lock(session_id):
+            self.db.rollback()
+            return
         
-        # Update or create summary
-        total_count = len(messages_to_summarize)
-        if existing_summary:
-            total_count += existing_summary.messages_count
+        # Re-check under the lock: a run that committed meanwhile already covered this block
+        active_messages = self.message_repo.get_active(session_id)
+        if ([msg.message_id for msg in active_messages[:len(message_ids)]] != message_ids
+                or [node.node_id for node in self.node_repo.get_roots(session_id)] != root_ids):
+            self.db.rollback()
+            return
         
-        self.summary_repo.create_or_update(session_id, new_summary, total_count)
+        # Mark messages as inactive, store their memory, add the chunk summary,
+        # roll up and update the session summary in one transaction, so a
+        # concurrent chat turn sees either the old or the new state
+        messages_to_summarize = active_messages[:len(message_ids)]
+        self.message_repo.mark_inactive(message_ids, commit=False)
+        if settings.MEMORY_ENABLED:
+            self.memory_service.remember(session_id, messages_to_summarize, commit=False, vectors=vectors)
+        self.node_repo.create(session_id, 0, chunk_summary, messages=messages_to_summarize, commit=False)
+        self._roll_up(session_id, segment_summaries)
+        self.summary_repo.create_or_update(session_id, session_text, total_count)
+    
+    def select_summaries(self, session_id: str) -> list[str]:
+        """Select summary levels covering the summarized history within SUMMARY_TOKEN_BUDGET.
         
-        # Mark messages as inactive
-        message_ids = [msg.message_id for msg in messages_to_summarize]
-        self.message_repo.mark_inactive(message_ids)
+        Starts from the tree roots, newest first. If they do not all fit
+        (or do not cover the whole history), the session summary stands in
+        for the older history. Remaining budget then expands the newest
+        segment summaries into their finer children, so recent history gets
+        the most detail while the prompt stays bounded however long the
+        session runs.
+        
+        Args:
+            session_id: The session's UUID.
+            
+        Returns:
+            Summary texts, oldest first.
+        """
+        budget = settings.SUMMARY_TOKEN_BUDGET
+        roots = self.node_repo.get_roots(session_id)
+        session_summary = self.summary_repo.get_by_session(session_id)
+        
+        covered = sum(node.messages_count for node in roots)
+        used = sum(_estimate_tokens(node.summary_text) for node in roots)
+        if session_summary is None or (used <= budget and covered >= session_summary.messages_count):
+            selected = roots
+            prefix = []
+        else:
+            prefix = [session_summary.summary_text]
+            used = _estimate_tokens(session_summary.summary_text)
+            selected = []
+            for node in reversed(roots):
+                cost = _estimate_tokens(node.summary_text)
+                if used + cost > budget:
+                    break
+                selected.insert(0, node)
+                used += cost
+        
+        # Refine newest first; stop at the first node that does not fit so
+        # older history never gets more detail than newer history
+        i = len(selected) - 1
+        while i >= 0:
+            node = selected[i]
+            if node.level == 0:
+                i -= 1
+                continue
+            children = self.node_repo.get_children(node.node_id)
+            extra = sum(_estimate_tokens(child.summary_text) for child in children) - _estimate_tokens(node.summary_text)
+            if not children or used + extra > budget:
+                break
+            selected[i:i + 1] = children
+            used += extra
+            i += len(children) - 1
+        
+        return prefix + [node.summary_text for node in selected]
+    
+    def _plan_roll_up(self, roots: list[PlannedNode]) -> tuple[list[str], list[PlannedNode]]:
+        """Generate the segment summaries that roll up a summary tree, without touching the database.
+        
+        Every SUMMARY_FANOUT oldest roots of a level are combined into a node
+        one level up, as _roll_up then writes them.
+        
+        Args:
+            roots: The tree roots, including the new chunk summary.
+            
+        Returns:
+            The segment summaries in the order _roll_up creates their nodes,
+            and the roots afterwards, oldest first.
+        """
+        fanout = max(settings.SUMMARY_FANOUT, 2)
+        segment_summaries = []
+        level = 0
+        while True:
+            nodes = sorted((node for node in roots if node.level == level), key=lambda node: node.first_message_id)
+            if len(nodes) < fanout:
+                return segment_summaries, sorted(roots, key=lambda node: node.first_message_id)
+            for start in range(0, len(nodes) - fanout + 1, fanout):
+                children = nodes[start:start + fanout]
+                segment_summary = self.llm_service.combine_summaries([node.summary_text for node in children])
+                segment_summaries.append(segment_summary)
+                roots = [node for node in roots if not any(node is child for child in children)]
+                roots.append(PlannedNode(
+                    level + 1, children[0].first_message_id,
+                    sum(node.messages_count for node in children), segment_summary
+                ))
+            level += 1
     
-    def _generate_summary(self, existing_summary: str, new_conversation: str) -> str:
-        """Generate a summary using the LLM.
+    def _roll_up(self, session_id: str, segment_summaries: list[str]) -> None:
+        """Write the rolled-up nodes planned by _plan_roll_up (caller holds the session lock).
         
         Args:
-            existing_summary: The existing summary text (if any).
-            new_conversation: New conversation to summarize.
+            session_id: The session's UUID.
+            segment_summaries: Segment summaries from _plan_roll_up.
+        """
+        fanout = max(settings.SUMMARY_FANOUT, 2)
+        summaries = iter(segment_summaries)
+        level = 0
+        while True:
+            nodes = self.node_repo.get_roots(session_id, level)
+            if len(nodes) < fanout:
+                return
+            for start in range(0, len(nodes) - fanout + 1, fanout):
+                children = nodes[start:start + fanout]
+                self.node_repo.create(session_id, level + 1, next(summaries), children=children, commit=False)
+            level += 1
+    
+    def _generate_session_summary(self, existing_text: str, roots: list[PlannedNode], total_count: int) -> str:
+        """Summarize the whole session from the tree roots.
+        
+        Args:
+            existing_text: The current session summary text.
+            roots: The tree roots after this run, oldest first.
+            total_count: Number of messages summarized including this run.
             
         Returns:
-            The generated summary text.
+            The session summary text.
         """
-        return self.llm_service.generate_summary(
-            conversation=new_conversation,
-            existing_summary=existing_summary if existing_summary else None
-        )
+        summaries = [node.summary_text for node in roots]
+        # History summarized before summary trees existed is only in the old session summary
+        if sum(node.messages_count for node in roots) < total_count:
+            summaries.insert(0, existing_text)
+        return self.llm_service.combine_summaries(summaries)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count of a text (about 4 characters per token)."""
+    return len(text) // 4 + 1
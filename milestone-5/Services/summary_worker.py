@@ -0,0 +1,156 @@
+"""Background worker for chat history summarization.
+
+This module provides the SummaryWorker class, a pool of threads that
+summarize old chat messages off the request path, so a chat response never
+waits for the summary LLM call.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from fastapi import Request
+from Database import SessionLocal
+from Services.summary_service import SummaryService
+from Services.model_registry import ModelRegistry
+from Config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryWorker:
+    """Thread pool that summarizes sessions queued by ChatService.
+    
+    A session is queued or running at most once at a time; submitting it
+    again meanwhile is a no-op, since each run summarizes everything past
+    the low watermark. Failed runs are retried with exponential backoff.
+    A session still past the high watermark after its last attempt (or a
+    restart) is queued again by its next chat message.
+    
+    Attributes:
+        registry: Shared model registry.
+        workers: Number of worker threads.
+    """
+    
+    def __init__(self, registry: ModelRegistry, workers: int = None) -> None:
+        """Initialize the worker.
+        
+        Args:
+            registry: Shared model registry.
+            workers: Number of worker threads (defaults to SUMMARY_WORKERS).
+        """
+        self.registry = registry
+        self.workers = workers or settings.SUMMARY_WORKERS
+        self._cond = threading.Condition()
+        self._queue: list[tuple[float, int, str, int]] = []  # (ready at, seq, session ID, attempt)
+        self._sessions: set[str] = set()  # queued or running
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+    
+    def start(self) -> None:
+        """Start the threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"summary-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def submit(self, session_id: str) -> bool:
+        """Queue a session for summarization.
+        
+        Args:
+            session_id: The session's UUID.
+        
+        Returns:
+            True if queued, False if the session is already queued or running.
+        """
+        with self._cond:
+            if session_id in self._sessions:
+                return False
+            self._sessions.add(session_id)
+            self._push(session_id, 1, 0)
+            return True
+    
+    def stop(self, timeout: float = 5) -> None:
+        """Stop the threads; queued sessions are dropped.
+        
+        Args:
+            timeout: Seconds to wait for each thread.
+        """
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+    
+    def _run(self) -> None:
+        """Worker loop: take the next ready session and summarize it."""
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            session_id, attempt = job
+            if self._summarize(session_id, attempt):
+                retry = False
+            else:
+                retry = attempt < settings.SUMMARY_MAX_ATTEMPTS
+            with self._cond:
+                if retry:
+                    self._push(session_id, attempt + 1, settings.SUMMARY_RETRY_SECONDS * 2 ** (attempt - 1))
+                else:
+                    self._sessions.discard(session_id)
+    
+    def _next(self) -> tuple[str, int] | None:
+        """Wait for the next session whose retry delay has passed.
+        
+        Returns:
+            (session ID, attempt), or None once the worker is stopped.
+        """
+        with self._cond:
+            while not self._stop.is_set():
+                if self._queue:
+                    ready_at, _, session_id, attempt = self._queue[0]
+                    delay = ready_at - time.monotonic()
+                    if delay <= 0:
+                        heapq.heappop(self._queue)
+                        return session_id, attempt
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+            return None
+    
+    def _push(self, session_id: str, attempt: int, delay: float) -> None:
+        """Queue a run of a session after a delay (caller holds the condition)."""
+        heapq.heappush(self._queue, (time.monotonic() + delay, next(self._seq), session_id, attempt))
+        self._cond.notify()
+    
+    def _summarize(self, session_id: str, attempt: int) -> bool:
+        """Summarize a session's old messages, logging a failed run.
+        
+        Args:
+            session_id: The session's UUID.
+            attempt: Attempt number, starting at 1.
+        
+        Returns:
+            True on success, False if the run failed.
+        """
+        db = SessionLocal()
+        try:
+            SummaryService(db, self.registry).summarize_old_messages(session_id)
+            return True
+        except Exception:
+            logger.exception(
+                "Summarizing session %s failed (attempt %d of %d)",
+                session_id, attempt, settings.SUMMARY_MAX_ATTEMPTS
+            )
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+
+def get_summary_worker(request: Request) -> SummaryWorker:
+    """Dependency for FastAPI to get the background summary worker."""
+    return request.app.state.summary_worker
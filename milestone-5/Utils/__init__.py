@@ -1,3 +1,5 @@
 """Utilities module for helper functions."""
 
-from Utils.id_generator import generate_uuid
+from Utils.id_generator import generate_uuid, generate_chunk_id, hash_content
+from Utils.ttl_cache import TTLCache
+from Utils.sse import format_sse
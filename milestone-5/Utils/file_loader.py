@@ -1,31 +1,127 @@
 from langchain_community.document_loaders import PyPDFLoader, TextLoader
 from langchain_core.documents import Document
+from pypdf import PdfReader
+from collections import deque
+from concurrent.futures import Executor
+from typing import BinaryIO, Iterator
+from Config import settings
+import shutil
 import tempfile
 import os
 
+# Block size for copying an upload to disk
+COPY_BUFFER_SIZE = 1024 * 1024
 
-def load_file(file_bytes: bytes, filename: str) -> list[Document]:
-    """Load file and return LangChain Documents.
+# Pages extracted by one process-pool task
+PAGES_PER_TASK = 16
+
+# Page-range tasks in flight per worker (bounds parsed-but-unconsumed pages)
+TASKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def iter_file(file: BinaryIO, filename: str, source: str = None, executor: Executor = None) -> Iterator[Document]:
+    """Load a file lazily, yielding LangChain Documents one page at a time.
+    
+    The file is copied to a temp file in fixed-size blocks, so it is never
+    held in memory as a whole. PDFs with at least PDF_PARALLEL_MIN_PAGES
+    pages are extracted in page ranges on the executor (a process pool),
+    still yielded in page order, with the same metadata keys PyPDFLoader
+    produces for the installed langchain version.
     
     Args:
-        file_bytes: Raw file content
+        file: Binary file object (e.g. a spooled upload)
         filename: Original filename (to detect type)
+        source: Source name for metadata (defaults to filename)
+        executor: Process pool for parallel PDF extraction (None to stay single-process)
     
-    Returns:
-        List of LangChain Document objects
+    Yields:
+        LangChain Document objects (one per PDF page)
     """
     suffix = os.path.splitext(filename)[1]
     
     with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(file_bytes)
+        shutil.copyfileobj(file, tmp, COPY_BUFFER_SIZE)
         tmp_path = tmp.name
     
-    if filename.endswith(".pdf"):
-        loader = PyPDFLoader(tmp_path)
-    else:
-        loader = TextLoader(tmp_path)
+    try:
+        if filename.endswith(".pdf") and executor is not None:
+            total_pages = len(PdfReader(tmp_path).pages)
+            if total_pages >= settings.PDF_PARALLEL_MIN_PAGES:
+                # The loader's first page is the metadata template for the parallel pages
+                pages = PyPDFLoader(tmp_path).lazy_load()
+                first = next(pages)
+                pages.close()
+                first.metadata["source"] = source or filename
+                yield first
+                yield from _iter_pdf_parallel(tmp_path, 1, total_pages, first.metadata, executor)
+                return
+        
+        if filename.endswith(".pdf"):
+            loader = PyPDFLoader(tmp_path)
+        else:
+            loader = TextLoader(tmp_path)
+        
+        for doc in loader.lazy_load():
+            # Loaders record the temp path; keep the original name instead
+            doc.metadata["source"] = source or filename
+            yield doc
+    finally:
+        os.unlink(tmp_path)  # Clean up
+
+
+def _iter_pdf_parallel(path: str, first_page: int, total_pages: int, metadata: dict,
+                       executor: Executor) -> Iterator[Document]:
+    """Extract PDF page ranges on a process pool, yielding pages in order.
+    
+    Only a bounded window of page-range tasks is in flight, so a slow
+    consumer does not let every parsed page pile up in memory.
+    
+    Args:
+        path: PDF file path
+        first_page: Index of the first page to extract
+        total_pages: Number of pages in the PDF
+        metadata: PyPDFLoader metadata of another page of the PDF (see _extract_pages)
+        executor: Process pool to run extraction on
+    
+    Yields:
+        LangChain Document objects (one per page)
+    """
+    window = (settings.PDF_PARSE_WORKERS or os.cpu_count() or 1) * TASKS_IN_FLIGHT_PER_WORKER
+    pending = deque()
+    try:
+        for start in range(first_page, total_pages, PAGES_PER_TASK):
+            end = min(start + PAGES_PER_TASK, total_pages)
+            pending.append(executor.submit(_extract_pages, path, start, end, metadata))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _extract_pages(path: str, start: int, end: int, metadata: dict) -> list[Document]:
+    """Extract a range of PDF pages (runs in a worker process).
     
-    documents = loader.load()
-    os.unlink(tmp_path)  # Clean up
+    Each page gets the loader's metadata with its own page index (and page
+    label, if the loader version records one), so pages carry the same keys
+    whether the PDF is parsed in parallel or by PyPDFLoader.
     
-    return documents
\ No newline at end of file
+    Args:
+        path: PDF file path
+        start: First page index (inclusive)
+        end: Last page index (exclusive)
+        metadata: PyPDFLoader metadata of another page of the same PDF
+    
+    Returns:
+        List of LangChain Document objects, in page order
+    """
+    reader = PdfReader(path)
+    documents = []
+    for page in range(start, end):
+        page_metadata = {**metadata, "page": page}
+        if "page_label" in metadata:
+            page_metadata["page_label"] = reader.page_labels[page]
+        documents.append(Document(page_content=reader.pages[page].extract_text(), metadata=page_metadata))
+    return documents
@@ -3,8 +3,12 @@
 This module provides helper functions for ID generation.
 """
 
+import hashlib
 import uuid
 
+# Namespace for deterministic chunk IDs
+CHUNK_NAMESPACE = uuid.UUID("6f1c2b0e-8d4a-5e7b-9c3f-2a1d0e4b7c58")
+
 
 def generate_uuid() -> str:
     """Generate a unique UUID string.
@@ -13,3 +17,31 @@ def generate_uuid() -> str:
         A string representation of a UUID4.
     """
     return str(uuid.uuid4())
+
+
+def hash_content(text: str) -> str:
+    """Hash chunk text.
+    
+    Args:
+        text: Chunk text content.
+    
+    Returns:
+        Hex SHA-256 digest of the text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def generate_chunk_id(source: str, content_hash: str) -> str:
+    """Generate a deterministic chunk ID from its source and content hash.
+    
+    The same text from the same source always gets the same ID, so
+    re-indexing a document recognizes chunks that are already stored.
+    
+    Args:
+        source: Document source name.
+        content_hash: Hash of the chunk text (see hash_content).
+    
+    Returns:
+        A string representation of a UUID5.
+    """
+    return str(uuid.uuid5(CHUNK_NAMESPACE, f"{source}\n{content_hash}"))
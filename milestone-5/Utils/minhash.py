@@ -0,0 +1,68 @@
+"""MinHash signatures for near-duplicate text detection.
+
+This module provides helper functions that summarize text as a MinHash
+signature of its word shingles. The fraction of equal signature positions
+estimates the Jaccard similarity of two texts' shingle sets, and hashing
+bands of the signature gives keys for locality-sensitive lookup.
+"""
+
+import hashlib
+import re
+import numpy as np
+
+NUM_PERMUTATIONS = 128
+
+# Number of words per shingle
+SHINGLE_SIZE = 3
+
+_WORD = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed permutation parameters, so signatures stay comparable across runs
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, (1 << 61) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, (1 << 61) - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def minhash(text: str) -> np.ndarray:
+    """Compute the MinHash signature of text's lowercased word shingles.
+    
+    Args:
+        text: Chunk text content.
+    
+    Returns:
+        uint32 array of NUM_PERMUTATIONS minimum hash values.
+    """
+    words = _WORD.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big") for s in shingles],
+        dtype=np.uint64
+    )
+    permuted = (hashes[:, None] * _A + _B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return float(np.mean(a == b))
+
+
+def band_keys(signature: np.ndarray, bands: int) -> list[int]:
+    """Hash each band of a signature into a lookup key.
+    
+    Texts with Jaccard similarity s share at least one key with probability
+    1 - (1 - s ** rows) ** bands, where rows = NUM_PERMUTATIONS / bands.
+    
+    Args:
+        signature: MinHash signature.
+        bands: Number of bands (must divide NUM_PERMUTATIONS).
+    
+    Returns:
+        One signed 64-bit key per band (fits an SQLite INTEGER).
+    """
+    return [
+        int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "big", signed=True)
+        for band in np.split(signature, bands)
+    ]
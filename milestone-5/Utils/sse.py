@@ -0,0 +1,19 @@
+"""Helpers for Server-Sent Events (SSE) responses.
+
+This module formats events for text/event-stream responses.
+"""
+
+import json
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event.
+    
+    Args:
+        event: The event name.
+        data: JSON-serializable event payload.
+        
+    Returns:
+        The event in text/event-stream wire format.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
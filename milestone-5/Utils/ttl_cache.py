@@ -0,0 +1,87 @@
+"""Thread-safe LRU cache with per-entry time-to-live.
+
+This module provides the TTLCache class used for in-process caches.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed TTL.
+    
+    Attributes:
+        max_size: Maximum number of entries kept.
+        ttl_seconds: Lifetime of an entry in seconds.
+        hits: Number of successful lookups.
+        misses: Number of failed lookups (absent or expired).
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600) -> None:
+        """Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries kept.
+            ttl_seconds: Lifetime of an entry in seconds.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Get a value and mark it as recently used.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The cached value, or None if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: The cache key.
+            value: The value to store.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Get cache size and hit-rate statistics.
+        
+        Returns:
+            Dict with size, max_size, hits, misses and hit_rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,19 @@
+"""Vector-store backends, keyword index and index bookkeeping for chunks."""
+
+from VectorStores.base import VectorStore
+from VectorStores.chroma_store import ChromaVectorStore
+from VectorStores.numpy_store import NumpyVectorStore
+from VectorStores.factory import create_vector_store
+from VectorStores.keyword_index import KeywordIndex
+from VectorStores.chunk_manifest import ChunkManifest
+from VectorStores.embedding_cache import EmbeddingCache
+from VectorStores.generations import (
+    active_generation,
+    generation_dir,
+    create_generation,
+    activate_generation,
+    prune_generations,
+    mark_written,
+    read_stamp,
+    write_lock,
+)
@@ -0,0 +1,78 @@
+"""Abstract interface for vector-store backends.
+
+This module defines the VectorStore base class that every backend implements.
+Embeddings are computed by the services and passed in; backends only store
+and search vectors.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class VectorStore(ABC):
+    """Interface for storing and searching chunk embeddings.
+    
+    Search hits are dicts with id, content, metadata and score, where score
+    is a distance (lower is better) comparable to Chroma's default L2 space.
+    """
+    
+    @abstractmethod
+    def add(self, ids: list[str], texts: list[str], metadatas: list[dict],
+            embeddings: list[list[float]]) -> None:
+        """Insert or replace chunks with their embeddings.
+        
+        Args:
+            ids: Unique chunk IDs.
+            texts: Chunk text content.
+            metadatas: Chunk metadata (e.g. source).
+            embeddings: Chunk embedding vectors.
+        """
+    
+    @abstractmethod
+    def search(self, embeddings: list[list[float]], top_k: int) -> list[list[dict]]:
+        """Find the nearest chunks for each query embedding.
+        
+        Args:
+            embeddings: Query embedding vectors.
+            top_k: Number of hits to return per query.
+            
+        Returns:
+            One list of hits per query, best first.
+        """
+    
+    @abstractmethod
+    def get(self, ids: list[str]) -> list[dict]:
+        """Fetch stored chunks by ID.
+        
+        Args:
+            ids: Chunk IDs to fetch.
+            
+        Returns:
+            Dicts with id, content and metadata for the IDs that exist.
+        """
+    
+    @abstractmethod
+    def delete(self, ids: list[str]) -> None:
+        """Remove chunks by ID.
+        
+        Args:
+            ids: Chunk IDs to remove.
+        """
+    
+    @abstractmethod
+    def count(self) -> int:
+        """Get the number of stored chunks.
+        
+        Returns:
+            Number of live chunks.
+        """
+    
+    def close(self) -> None:
+        """Release the store so the directory can be reopened from disk."""
+    
+    def stats(self) -> dict:
+        """Get statistics for the store.
+        
+        Returns:
+            Dict with at least backend and count.
+        """
+        return {"backend": type(self).__name__, "count": self.count()}
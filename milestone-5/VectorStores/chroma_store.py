@@ -0,0 +1,93 @@
+"""ChromaDB vector-store backend."""
+
+import chromadb
+from VectorStores.base import VectorStore
+
+# Collection used by LangChain's Chroma wrapper, so existing indexes keep working
+COLLECTION_NAME = "langchain"
+
+
+class ChromaVectorStore(VectorStore):
+    """Vector store backed by a persistent ChromaDB collection.
+    
+    Attributes:
+        persist_dir: Directory where ChromaDB persists its data.
+        client: ChromaDB persistent client.
+        collection: The chunk collection.
+    """
+    
+    def __init__(self, persist_dir: str) -> None:
+        """Open (or create) the Chroma collection.
+        
+        Args:
+            persist_dir: Directory where ChromaDB persists its data.
+        """
+        self.persist_dir = persist_dir
+        self.client = chromadb.PersistentClient(path=persist_dir)
+        self.collection = self.client.get_or_create_collection(COLLECTION_NAME)
+    
+    def add(self, ids: list[str], texts: list[str], metadatas: list[dict],
+            embeddings: list[list[float]]) -> None:
+        """Upsert chunks in batches Chroma accepts."""
+        batch_size = self.client.get_max_batch_size()
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            self.collection.upsert(
+                ids=ids[start:end],
+                documents=texts[start:end],
+                metadatas=metadatas[start:end],
+                embeddings=embeddings[start:end]
+            )
+    
+    def search(self, embeddings: list[list[float]], top_k: int) -> list[list[dict]]:
+        """Query all embeddings in one Chroma call."""
+        if not embeddings or self.collection.count() == 0:
+            return [[] for _ in embeddings]
+        
+        results = self.collection.query(
+            query_embeddings=embeddings,
+            n_results=top_k,
+            include=["documents", "metadatas", "distances"]
+        )
+        
+        output = []
+        for i in range(len(embeddings)):
+            hits = zip(
+                results["ids"][i], results["documents"][i],
+                results["metadatas"][i], results["distances"][i]
+            )
+            output.append([
+                {"id": chunk_id, "content": content, "metadata": metadata or {}, "score": float(distance)}
+                for chunk_id, content, metadata, distance in hits
+            ])
+        return output
+    
+    def get(self, ids: list[str]) -> list[dict]:
+        """Fetch chunks by ID."""
+        if not ids:
+            return []
+        results = self.collection.get(ids=ids, include=["documents", "metadatas"])
+        return [
+            {"id": chunk_id, "content": content, "metadata": metadata or {}}
+            for chunk_id, content, metadata in zip(results["ids"], results["documents"], results["metadatas"])
+        ]
+    
+    def delete(self, ids: list[str]) -> None:
+        """Delete chunks by ID."""
+        if ids:
+            self.collection.delete(ids=ids)
+    
+    def count(self) -> int:
+        """Count chunks in the collection."""
+        return self.collection.count()
+    
+    def close(self) -> None:
+        """Drop Chroma's cached clients so the next client reloads the directory from disk.
+        
+        Collections that are still open keep working on their own client.
+        """
+        self.client.clear_system_cache()
+    
+    def stats(self) -> dict:
+        """Report the chunk count (Chroma stores full-precision vectors only)."""
+        return {"backend": "chroma", "count": self.count()}
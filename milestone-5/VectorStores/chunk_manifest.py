@@ -0,0 +1,222 @@
+"""Persistent manifest of indexed chunks.
+
+This module provides the ChunkManifest class, a SQLite table recording which
+chunk IDs (and content hashes) are stored for each source so re-indexing a
+document only embeds and writes the chunks that changed. It also indexes the
+MinHash signatures of stored chunks for near-duplicate lookup and records
+near-duplicate chunks that were linked to a stored chunk instead of being
+stored themselves.
+"""
+
+import json
+import sqlite3
+import threading
+import numpy as np
+from Utils.minhash import band_keys, jaccard
+
+# LSH bands indexed per chunk (8 signature rows each); a stored chunk with
+# Jaccard similarity 0.85 shares a band with probability 0.99
+MINHASH_BANDS = 16
+
+
+class ChunkManifest:
+    """Source to chunk-ID manifest backed by SQLite.
+    
+    Attributes:
+        path: SQLite database file.
+    """
+    
+    def __init__(self, path: str) -> None:
+        """Open (or create) the manifest.
+        
+        Args:
+            path: SQLite database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "chunk_id TEXT PRIMARY KEY, source TEXT NOT NULL, content_hash TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_chunks_source ON chunks (source)")
+        if "signature" not in {row[1] for row in self._db.execute("PRAGMA table_info(chunks)")}:
+            self._db.execute("ALTER TABLE chunks ADD COLUMN signature BLOB")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS minhash_bands ("
+            "band INTEGER NOT NULL, key INTEGER NOT NULL, chunk_id TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_minhash_bands ON minhash_bands (band, key)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_minhash_bands_chunk ON minhash_bands (chunk_id)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS duplicates ("
+            "chunk_id TEXT PRIMARY KEY, source TEXT NOT NULL, content_hash TEXT NOT NULL, "
+            "duplicate_of TEXT NOT NULL, text TEXT NOT NULL, metadata TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_duplicates_source ON duplicates (source)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_duplicates_of ON duplicates (duplicate_of)")
+        self._db.commit()
+    
+    def source_chunks(self, source: str) -> dict[str, str]:
+        """Get the chunks stored for a source.
+        
+        Args:
+            source: Document source name.
+        
+        Returns:
+            Dict of chunk ID to content hash.
+        """
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT chunk_id, content_hash FROM chunks WHERE source = ?", (source,)
+            ).fetchall())
+    
+    def source_duplicates(self, source: str) -> dict[str, str]:
+        """Get the chunks of a source that are linked to a near-duplicate instead of stored.
+        
+        Args:
+            source: Document source name.
+        
+        Returns:
+            Dict of chunk ID to content hash.
+        """
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT chunk_id, content_hash FROM duplicates WHERE source = ?", (source,)
+            ).fetchall())
+    
+    def add(self, source: str, chunks: dict[str, str], signatures: dict[str, np.ndarray] = None) -> None:
+        """Record chunks as stored for a source.
+        
+        A chunk that was linked as a duplicate is replaced by the stored one.
+        
+        Args:
+            source: Document source name.
+            chunks: Dict of chunk ID to content hash.
+            signatures: Dict of chunk ID to MinHash signature, for near-duplicate lookup.
+        """
+        signatures = signatures or {}
+        with self._lock:
+            self._delete_rows("minhash_bands", list(chunks))
+            self._db.executemany(
+                "INSERT OR REPLACE INTO chunks (chunk_id, source, content_hash, signature) VALUES (?, ?, ?, ?)",
+                [
+                    (chunk_id, source, content_hash,
+                     signatures[chunk_id].tobytes() if chunk_id in signatures else None)
+                    for chunk_id, content_hash in chunks.items()
+                ]
+            )
+            self._db.executemany(
+                "INSERT INTO minhash_bands (band, key, chunk_id) VALUES (?, ?, ?)",
+                [
+                    (band, key, chunk_id)
+                    for chunk_id, signature in signatures.items()
+                    for band, key in enumerate(band_keys(signature, MINHASH_BANDS))
+                ]
+            )
+            self._delete_rows("duplicates", list(chunks))
+            self._db.commit()
+    
+    def add_duplicates(self, source: str, duplicates: list[tuple[str, str, str, str, dict]]) -> None:
+        """Record chunks of a source as near-duplicates of stored chunks.
+        
+        Their text and metadata are kept so one can take the stored chunk's
+        place if that chunk is removed.
+        
+        Args:
+            source: Document source name.
+            duplicates: (chunk ID, content hash, stored chunk ID, text, metadata) tuples.
+        """
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO duplicates (chunk_id, source, content_hash, duplicate_of, text, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (chunk_id, source, content_hash, duplicate_of, text, json.dumps(metadata, default=str))
+                    for chunk_id, content_hash, duplicate_of, text, metadata in duplicates
+                ]
+            )
+            self._db.commit()
+    
+    def find_near_duplicate(self, signature: np.ndarray, threshold: float) -> str | None:
+        """Find the stored chunk most similar to a new one, if similar enough.
+        
+        Candidates sharing an LSH band with the signature are compared by
+        estimated Jaccard similarity.
+        
+        Args:
+            signature: MinHash signature of the new chunk.
+            threshold: Minimum estimated Jaccard similarity.
+        
+        Returns:
+            ID of the most similar stored chunk, or None if none reaches the threshold.
+        """
+        keys = band_keys(signature, MINHASH_BANDS)
+        where = " OR ".join("(b.band = ? AND b.key = ?)" for _ in keys)
+        with self._lock:
+            candidates = self._db.execute(
+                "SELECT DISTINCT c.chunk_id, c.signature FROM minhash_bands b "
+                f"JOIN chunks c ON c.chunk_id = b.chunk_id WHERE {where}",
+                [x for band, key in enumerate(keys) for x in (band, key)]
+            ).fetchall()
+        best_id, best_similarity = None, threshold
+        for chunk_id, stored in candidates:
+            similarity = jaccard(signature, np.frombuffer(stored, dtype=np.uint32))
+            if similarity >= best_similarity:
+                best_id, best_similarity = chunk_id, similarity
+        return best_id
+    
+    def duplicates_of(self, ids: list[str]) -> list[tuple[str, str, str, str, str, dict]]:
+        """Get the chunks linked to any of the given stored chunks.
+        
+        Args:
+            ids: Stored chunk IDs.
+        
+        Returns:
+            (chunk ID, source, content hash, stored chunk ID, text, metadata) tuples.
+        """
+        rows = []
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(self._db.execute(
+                    "SELECT chunk_id, source, content_hash, duplicate_of, text, metadata FROM duplicates "
+                    f"WHERE duplicate_of IN ({placeholders}) ORDER BY chunk_id",
+                    batch
+                ).fetchall())
+        return [(chunk_id, source, content_hash, duplicate_of, text, json.loads(metadata))
+                for chunk_id, source, content_hash, duplicate_of, text, metadata in rows]
+    
+    def relink(self, old_id: str, new_id: str) -> None:
+        """Point the duplicates of one stored chunk at another.
+        
+        Args:
+            old_id: Removed stored chunk ID.
+            new_id: Stored chunk ID that replaces it.
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE duplicates SET duplicate_of = ? WHERE duplicate_of = ? AND chunk_id != ?",
+                (new_id, old_id, new_id)
+            )
+            self._db.commit()
+    
+    def delete(self, ids: list[str]) -> None:
+        """Remove chunks (stored or linked duplicates) from the manifest.
+        
+        Args:
+            ids: Chunk IDs.
+        """
+        with self._lock:
+            self._delete_rows("chunks", ids)
+            self._delete_rows("duplicates", ids)
+            self._delete_rows("minhash_bands", ids)
+            self._db.commit()
+    
+    def _delete_rows(self, table: str, ids: list[str]) -> None:
+        """Delete rows of a table by chunk ID (caller holds the lock and commits)."""
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            self._db.execute(f"DELETE FROM {table} WHERE chunk_id IN ({placeholders})", batch)
@@ -0,0 +1,181 @@
+"""Persistent content-addressed cache of chunk embeddings.
+
+This module provides the EmbeddingCache class, a SQLite table of float32
+embedding vectors keyed by (embedding model, chunk text hash) so identical
+chunk text is embedded only once across re-chunking, store rebuilds and
+overlapping uploads. The least recently used entries are evicted once the
+stored vectors exceed a size limit. The total size is kept in the database
+and updated in each write transaction, so the API workers and the bulk
+indexer sharing one cache file all evict against the same number.
+"""
+
+import sqlite3
+import threading
+import time
+import numpy as np
+
+# Eviction frees space down to this fraction of max_bytes
+EVICT_TO_FRACTION = 0.9
+
+
+class EmbeddingCache:
+    """Size-bounded, least-recently-used embedding cache backed by SQLite.
+    
+    Attributes:
+        path: SQLite database file.
+        max_bytes: Maximum total size of the stored vectors.
+        hits: Number of texts found in the cache.
+        misses: Number of texts not found in the cache.
+    """
+    
+    def __init__(self, path: str, max_bytes: int) -> None:
+        """Open (or create) the cache.
+        
+        Args:
+            path: SQLite database file.
+            max_bytes: Maximum total size of the stored vectors.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, content_hash BLOB NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL, "
+            "PRIMARY KEY (model, content_hash))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._db.commit()
+        
+        # Caches created before the size was stored get it counted once
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute(
+            "INSERT OR IGNORE INTO meta (key, value) "
+            "SELECT 'size_bytes', COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        )
+        self._db.commit()
+    
+    def get_many(self, model: str, content_hashes: list[str]) -> list[list[float] | None]:
+        """Look up cached embeddings, marking the hits as recently used.
+        
+        Args:
+            model: Embedding model name.
+            content_hashes: Hex hashes of the chunk texts (see hash_content).
+        
+        Returns:
+            One embedding per hash, or None where the text is not cached.
+        """
+        keys = list({bytes.fromhex(h) for h in content_hashes})
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._db.execute(
+                    f"SELECT content_hash, vector FROM embeddings WHERE model = ? AND content_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall())
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND content_hash = ?",
+                    [(now, model, key) for key in found]
+                )
+                self._db.commit()
+            
+            vectors = []
+            for content_hash in content_hashes:
+                vector = found.get(bytes.fromhex(content_hash))
+                vectors.append(None if vector is None else np.frombuffer(vector, dtype=np.float32).tolist())
+            hits = sum(vector is not None for vector in vectors)
+            self.hits += hits
+            self.misses += len(vectors) - hits
+            return vectors
+    
+    def put_many(self, model: str, embeddings: dict[str, list[float]]) -> None:
+        """Store embeddings, evicting the least recently used ones if over the size limit.
+        
+        Args:
+            model: Embedding model name.
+            embeddings: Dict of hex content hash to embedding.
+        """
+        if not embeddings:
+            return
+        now = time.time()
+        rows = [
+            (model, bytes.fromhex(content_hash), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for content_hash, vector in embeddings.items()
+        ]
+        with self._lock:
+            # Take the write lock before reading sizes, so other processes cannot interleave
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                replaced = self._vector_bytes(model, [key for _, key, _, _ in rows])
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, content_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                size_bytes = self._add_size(sum(len(vector) for _, _, vector, _ in rows) - replaced)
+                if size_bytes > self.max_bytes:
+                    self._evict(size_bytes - int(self.max_bytes * EVICT_TO_FRACTION))
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+    
+    def stats(self) -> dict:
+        """Get cache statistics.
+        
+        Returns:
+            Dict with entries, size_bytes, max_bytes, hits, misses and hit_rate.
+        """
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            size_bytes = self._db.execute("SELECT value FROM meta WHERE key = 'size_bytes'").fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                "entries": entries,
+                "size_bytes": size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+    
+    def _vector_bytes(self, model: str, keys: list[bytes]) -> int:
+        """Total size of the vectors already stored under the given keys (caller holds the lock)."""
+        total = 0
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            total += self._db.execute(
+                f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings WHERE model = ? AND content_hash IN ({placeholders})",
+                [model, *batch]
+            ).fetchone()[0]
+        return total
+    
+    def _add_size(self, delta: int) -> int:
+        """Adjust the stored total size of the vectors (caller holds the write transaction).
+        
+        Returns:
+            The new total size.
+        """
+        self._db.execute("UPDATE meta SET value = value + ? WHERE key = 'size_bytes'", (delta,))
+        return self._db.execute("SELECT value FROM meta WHERE key = 'size_bytes'").fetchone()[0]
+    
+    def _evict(self, excess: int) -> None:
+        """Delete least recently used entries until excess bytes are freed (caller holds the write transaction)."""
+        victims = []
+        freed = 0
+        for model, content_hash, size in self._db.execute(
+            "SELECT model, content_hash, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        ):
+            if freed >= excess:
+                break
+            victims.append((model, content_hash))
+            freed += size
+        self._db.executemany("DELETE FROM embeddings WHERE model = ? AND content_hash = ?", victims)
+        self._add_size(-freed)
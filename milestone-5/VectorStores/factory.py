@@ -0,0 +1,34 @@
+"""Factory for the configured vector-store backend."""
+
+import os
+from Config import settings
+from VectorStores.base import VectorStore
+from VectorStores.chroma_store import ChromaVectorStore
+from VectorStores.numpy_store import NumpyVectorStore
+
+
+def create_vector_store(storage_dir: str, backend: str = None) -> VectorStore:
+    """Open the vector store for a storage directory.
+    
+    Args:
+        storage_dir: Root storage directory; each backend uses its own subdirectory.
+        backend: "chroma" or "numpy" (defaults to settings.VECTOR_BACKEND).
+        
+    Returns:
+        The opened VectorStore.
+        
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    backend = backend or settings.VECTOR_BACKEND
+    if backend == "chroma":
+        return ChromaVectorStore(os.path.join(storage_dir, "chroma_db"))
+    if backend == "numpy":
+        return NumpyVectorStore(
+            os.path.join(storage_dir, "numpy_index"),
+            ivf_threshold=settings.NUMPY_IVF_THRESHOLD,
+            nprobe=settings.NUMPY_IVF_NPROBE,
+            quantization=settings.NUMPY_QUANTIZATION,
+            oversample=settings.NUMPY_RESCORE_OVERSAMPLE
+        )
+    raise ValueError(f"Unknown vector backend: {backend}")
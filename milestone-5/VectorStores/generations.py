@@ -0,0 +1,172 @@
+"""Versioned index generations under a storage directory.
+
+A full rebuild writes a new generation directory under storage/generations/
+while queries keep using the active one. Activating a generation atomically
+replaces the CURRENT pointer file. Writers also replace a stamp file in the
+generation after every change. Any process can therefore detect a swap or
+another process's writes by reading two tiny files. Writers serialize on an
+flock'ed lock file in the index directory, so the API workers and the bulk
+indexer never write the same generation at once.
+
+Without a pointer file (indexes built before generations existed), the
+storage directory itself is the active index.
+"""
+
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+POINTER_FILE = "CURRENT"
+GENERATIONS_DIR = "generations"
+STAMP_FILE = "WRITTEN"
+LOCK_FILE = "WRITE.lock"
+
+
+def active_generation(storage_dir: str) -> str | None:
+    """Get the name of the active generation.
+    
+    Args:
+        storage_dir: Root storage directory.
+    
+    Returns:
+        The generation name, or None if the storage directory itself is the index.
+    """
+    return _read(os.path.join(storage_dir, POINTER_FILE))
+
+
+def generation_dir(storage_dir: str, generation: str | None) -> str:
+    """Get the directory holding a generation's vector store, keyword index and manifest.
+    
+    Args:
+        storage_dir: Root storage directory.
+        generation: Generation name, or None for the storage directory itself.
+    
+    Returns:
+        The index directory.
+    """
+    if generation is None:
+        return storage_dir
+    return os.path.join(storage_dir, GENERATIONS_DIR, generation)
+
+
+def create_generation(storage_dir: str) -> str:
+    """Create an empty, inactive generation.
+    
+    Args:
+        storage_dir: Root storage directory.
+    
+    Returns:
+        The new generation name (sortable by creation time).
+    """
+    generation = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    os.makedirs(generation_dir(storage_dir, generation))
+    return generation
+
+
+def activate_generation(storage_dir: str, generation: str) -> None:
+    """Atomically point the storage directory at a generation.
+    
+    Args:
+        storage_dir: Root storage directory.
+        generation: Name of an existing generation.
+    
+    Raises:
+        FileNotFoundError: If the generation does not exist.
+    """
+    if not os.path.isdir(generation_dir(storage_dir, generation)):
+        raise FileNotFoundError(f"Index generation not found: {generation}")
+    _replace(os.path.join(storage_dir, POINTER_FILE), generation)
+
+
+def prune_generations(storage_dir: str, keep: int) -> list[str]:
+    """Delete all but the newest generations, never the active one.
+    
+    Args:
+        storage_dir: Root storage directory.
+        keep: Number of generations to keep, including the active one.
+    
+    Returns:
+        Names of the deleted generations.
+    """
+    root = os.path.join(storage_dir, GENERATIONS_DIR)
+    if not os.path.isdir(root):
+        return []
+    active = active_generation(storage_dir)
+    kept = {active}
+    pruned = []
+    for generation in sorted(os.listdir(root), reverse=True):
+        if generation in kept:
+            continue
+        if len(kept) < keep:
+            kept.add(generation)
+            continue
+        shutil.rmtree(os.path.join(root, generation), ignore_errors=True)
+        pruned.append(generation)
+    return pruned
+
+
+def mark_written(index_dir: str) -> str:
+    """Record that an index directory changed.
+    
+    Args:
+        index_dir: Index directory (see generation_dir).
+    
+    Returns:
+        The new stamp.
+    """
+    stamp = uuid.uuid4().hex
+    _replace(os.path.join(index_dir, STAMP_FILE), stamp)
+    return stamp
+
+
+def read_stamp(index_dir: str) -> str | None:
+    """Get the stamp of the last recorded change to an index directory (None if never written)."""
+    return _read(os.path.join(index_dir, STAMP_FILE))
+
+
+@contextmanager
+def write_lock(index_dir: str) -> Iterator[None]:
+    """Hold the exclusive cross-process write lock of an index directory.
+    
+    The lock is released by the OS if the holding process dies.
+    
+    Args:
+        index_dir: Index directory (see generation_dir).
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, LOCK_FILE), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _read(path: str) -> str | None:
+    """Read a small text file, or None if it does not exist."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _replace(path: str, content: str) -> None:
+    """Write a small text file atomically (readers see the old or the new content)."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,127 @@
+"""Persistent BM25 keyword index over chunk text.
+
+This module provides the KeywordIndex class, an inverted index stored in
+SQLite and updated incrementally as chunks are added or deleted. It
+complements vector search for exact-term queries such as product codes.
+"""
+
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordIndex:
+    """BM25 inverted index backed by SQLite.
+    
+    Attributes:
+        path: SQLite database file.
+        k1: BM25 term-frequency saturation.
+        b: BM25 length normalization.
+    """
+    
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75) -> None:
+        """Open (or create) the index.
+        
+        Args:
+            path: SQLite database file.
+            k1: BM25 term-frequency saturation.
+            b: BM25 length normalization.
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS docs (chunk_id TEXT PRIMARY KEY, length INTEGER NOT NULL)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, chunk_id TEXT NOT NULL, tf INTEGER NOT NULL, "
+            "PRIMARY KEY (term, chunk_id)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_postings_chunk_id ON postings (chunk_id)")
+        self._db.commit()
+    
+    def add(self, ids: list[str], texts: list[str]) -> None:
+        """Index chunks, replacing any existing entries with the same ID.
+        
+        Args:
+            ids: Chunk IDs.
+            texts: Chunk text content.
+        """
+        with self._lock:
+            self._delete(ids)
+            for chunk_id, text in zip(ids, texts):
+                counts = Counter(tokenize(text))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO docs (chunk_id, length) VALUES (?, ?)",
+                    (chunk_id, sum(counts.values()))
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                    [(term, chunk_id, tf) for term, tf in counts.items()]
+                )
+            self._db.commit()
+    
+    def delete(self, ids: list[str]) -> None:
+        """Remove chunks from the index.
+        
+        Args:
+            ids: Chunk IDs.
+        """
+        with self._lock:
+            self._delete(ids)
+            self._db.commit()
+    
+    def search(self, query: str, top_k: int) -> list[tuple[str, float]]:
+        """Rank chunks by BM25 score for the query terms.
+        
+        Args:
+            query: Query text.
+            top_k: Number of hits to return.
+        
+        Returns:
+            (chunk_id, score) pairs, best first.
+        """
+        terms = list(set(tokenize(query)))
+        if not terms or top_k <= 0:
+            return []
+        
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            doc_count, avg_length = self._db.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+            if not doc_count:
+                return []
+            document_frequency = dict(self._db.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term", terms
+            ).fetchall())
+            postings = self._db.execute(
+                f"SELECT p.term, p.chunk_id, p.tf, d.length FROM postings p "
+                f"JOIN docs d ON d.chunk_id = p.chunk_id WHERE p.term IN ({placeholders})", terms
+            ).fetchall()
+        
+        avg_length = avg_length or 1.0
+        scores = {}
+        for term, chunk_id, tf, length in postings:
+            df = document_frequency[term]
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+    
+    def _delete(self, ids: list[str]) -> None:
+        """Delete postings and document rows for the IDs (caller commits)."""
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            self._db.execute(f"DELETE FROM postings WHERE chunk_id IN ({placeholders})", batch)
+            self._db.execute(f"DELETE FROM docs WHERE chunk_id IN ({placeholders})", batch)
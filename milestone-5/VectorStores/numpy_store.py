@@ -0,0 +1,451 @@
+"""In-process NumPy vector-store backend.
+
+This module provides the NumpyVectorStore class. Normalized float32 embeddings
+are appended to a single contiguous file that is memory-mapped for search, so
+opening an index costs a mmap instead of a full load. Chunk text and metadata
+live in a small SQLite table next to it.
+
+Small corpora are searched exactly with one matrix-vector product and
+argpartition. Once the corpus reaches ivf_threshold chunks, a coarse IVF index
+(spherical k-means centroids + inverted lists) is trained and only the
+nprobe closest lists are scanned.
+
+With int8 or binary quantization, candidates are first scored on the compact
+codes and only the best top_k * oversample are rescored against the
+full-precision vectors, so a scan touches 4-32x fewer bytes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+from VectorStores.base import VectorStore
+from VectorStores.quantization import create_quantizer
+
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.sqlite3"
+IVF_CENTROIDS_FILE = "ivf_centroids.npy"
+IVF_LISTS_FILE = "ivf_lists.npy"
+IVF_OFFSETS_FILE = "ivf_offsets.npy"
+
+# Rows are scanned and assigned to IVF lists in blocks to bound temporary memory
+ASSIGN_BLOCK_ROWS = 65536
+
+# Stay well below SQLite's limit on bound parameters per statement
+SQL_BATCH = 500
+
+
+class NumpyVectorStore(VectorStore):
+    """Vector store backed by a memory-mapped float32 matrix.
+    
+    Attributes:
+        persist_dir: Directory holding the vectors, records and IVF files.
+        ivf_threshold: Live chunk count at which IVF search is enabled.
+        nprobe: Number of IVF lists scanned per query.
+        quantization: Compact code scheme ("none", "int8" or "binary").
+        oversample: Shortlist size, as a multiple of top_k, rescored in float32.
+        dim: Embedding dimension, or None before the first insert.
+    """
+    
+    def __init__(self, persist_dir: str, ivf_threshold: int = 50000, nprobe: int = 8,
+                 quantization: str = "none", oversample: int = 4) -> None:
+        """Open (or create) the index in persist_dir.
+        
+        Args:
+            persist_dir: Directory holding the index files.
+            ivf_threshold: Live chunk count at which IVF search is enabled.
+            nprobe: Number of IVF lists scanned per query.
+            quantization: Compact code scheme ("none", "int8" or "binary").
+            oversample: Shortlist size, as a multiple of top_k, rescored in float32.
+        """
+        os.makedirs(persist_dir, exist_ok=True)
+        self.persist_dir = persist_dir
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.quantization = quantization
+        self.oversample = oversample
+        self._quantizer = None
+        self._recall = None
+        self._lock = threading.RLock()
+        self._vectors_path = os.path.join(persist_dir, VECTORS_FILE)
+        
+        self._db = sqlite3.connect(os.path.join(persist_dir, RECORDS_FILE), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "row INTEGER PRIMARY KEY, chunk_id TEXT NOT NULL, content TEXT, "
+            "metadata TEXT, deleted INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_records_chunk_id ON records (chunk_id)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.commit()
+        
+        self.dim = self._get_meta("dim")
+        self._load()
+    
+    # ---------- VectorStore interface ----------
+    
+    def add(self, ids: list[str], texts: list[str], metadatas: list[dict],
+            embeddings: list[list[float]]) -> None:
+        """Append chunks; an existing ID is replaced by tombstoning its old row."""
+        if not ids:
+            return
+        
+        # Keep only the last occurrence of an ID within this call
+        latest = {chunk_id: i for i, chunk_id in enumerate(ids)}
+        keep = sorted(latest.values())
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32)[keep])
+        
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._set_meta("dim", self.dim)
+                self._quantizer = create_quantizer(self.quantization, self.persist_dir, self.dim)
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+            
+            self._tombstone([ids[i] for i in keep])
+            
+            start = self._rows
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            if self._quantizer:
+                self._quantizer.append(vectors)
+            self._db.executemany(
+                "INSERT INTO records (row, chunk_id, content, metadata) VALUES (?, ?, ?, ?)",
+                [(start + n, ids[i], texts[i], json.dumps(metadatas[i])) for n, i in enumerate(keep)]
+            )
+            self._db.commit()
+            
+            self._rows += len(keep)
+            self._deleted = np.concatenate([self._deleted, np.zeros(len(keep), dtype=bool)])
+            self._map_vectors()
+            self._update_ivf()
+    
+    def search(self, embeddings: list[list[float]], top_k: int) -> list[list[dict]]:
+        """Top-k search by cosine similarity (exact, IVF and/or quantized)."""
+        if not embeddings:
+            return []
+        
+        hits = self._search_rows(_normalize(np.asarray(embeddings, dtype=np.float32)), top_k)
+        records = self._fetch_rows({row for query_hits in hits for row, _ in query_hits})
+        return [
+            [
+                {**records[row], "score": 2.0 - 2.0 * similarity}
+                for row, similarity in query_hits
+            ]
+            for query_hits in hits
+        ]
+    
+    def get(self, ids: list[str]) -> list[dict]:
+        """Fetch live chunks by ID."""
+        rows = []
+        with self._lock:
+            for batch in _batches(ids):
+                rows += self._db.execute(
+                    f"SELECT chunk_id, content, metadata FROM records "
+                    f"WHERE deleted = 0 AND chunk_id IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+        return [{"id": chunk_id, "content": content, "metadata": json.loads(metadata)} for chunk_id, content, metadata in rows]
+    
+    def delete(self, ids: list[str]) -> None:
+        """Tombstone chunks by ID; their rows are skipped by search."""
+        if not ids:
+            return
+        with self._lock:
+            self._tombstone(ids)
+            self._db.commit()
+    
+    def count(self) -> int:
+        """Count live (non-deleted) chunks."""
+        with self._lock:
+            return self._rows - int(self._deleted.sum())
+    
+    def stats(self) -> dict:
+        """Report size, scan footprint and recall of the configured search path."""
+        with self._lock:
+            ivf_active = self._ivf is not None and self.count() >= self.ivf_threshold
+            bytes_per_vector = self._quantizer.bytes_per_vector() if self._quantizer else 4 * (self.dim or 0)
+        return {
+            "backend": "numpy",
+            "count": self.count(),
+            "quantization": self.quantization,
+            "ivf": ivf_active,
+            "bytes_per_vector": bytes_per_vector,
+            "recall_at_k": self.estimate_recall()
+        }
+    
+    def estimate_recall(self, top_k: int = 10, sample_size: int = 50) -> float | None:
+        """Estimate recall@k of IVF/quantized search against exact float32 search.
+        
+        Stored vectors are used as sample queries. The estimate is cached
+        until the index changes.
+        
+        Args:
+            top_k: Number of neighbours compared per query.
+            sample_size: Number of sample queries.
+        
+        Returns:
+            Mean fraction of exact top-k neighbours found, or None if empty.
+        """
+        with self._lock:
+            matrix, deleted, rows = self._matrix, self._deleted.copy(), self._rows
+            version = (rows, int(deleted.sum()))
+            if self._recall and self._recall[0] == version:
+                return self._recall[1]
+        live = np.flatnonzero(~deleted)
+        if len(live) == 0:
+            return None
+        
+        sample = np.random.default_rng(0).choice(live, min(sample_size, len(live)), replace=False)
+        queries = np.asarray(matrix[np.sort(sample)])
+        approximate = self._search_rows(queries, top_k)
+        exact = self._exact_rows(queries, top_k, matrix, deleted, rows)
+        recall = float(np.mean([
+            len({row for row, _ in a} & {row for row, _ in e}) / len(e)
+            for a, e in zip(approximate, exact) if e
+        ]))
+        
+        with self._lock:
+            self._recall = (version, recall)
+        return recall
+    
+    # ---------- Search ----------
+    
+    def _search_rows(self, queries: np.ndarray, top_k: int) -> list[list[tuple[int, float]]]:
+        """Find (row, cosine similarity) of the top_k hits for each normalized query."""
+        with self._lock:
+            matrix, deleted, rows = self._matrix, self._deleted, self._rows
+            ivf = self._ivf if self.count() >= self.ivf_threshold else None
+            quantizer = self._quantizer
+        if matrix is None or top_k <= 0:
+            return [[] for _ in queries]
+        
+        if ivf is None and quantizer is None:
+            return self._exact_rows(queries, top_k, matrix, deleted, rows)
+        
+        hits = []
+        for query in queries:
+            if ivf is None:
+                candidates = np.arange(rows)
+            else:
+                candidates = self._ivf_candidates(ivf, query, rows)
+            
+            if quantizer is not None:
+                approx = quantizer.scores(query, candidates)
+                approx[deleted[candidates]] = -np.inf
+                shortlist = _top_k(approx, top_k * self.oversample)
+                candidates = np.sort(candidates[shortlist[np.isfinite(approx[shortlist])]])
+            
+            scores = np.asarray(matrix[candidates]) @ query
+            scores[deleted[candidates]] = -np.inf
+            best = _top_k(scores, top_k)
+            best = best[np.isfinite(scores[best])]
+            hits.append([(int(candidates[i]), float(scores[i])) for i in best])
+        return hits
+    
+    def _exact_rows(self, queries: np.ndarray, top_k: int, matrix: np.memmap,
+                    deleted: np.ndarray, rows: int) -> list[list[tuple[int, float]]]:
+        """Brute-force top-k over all rows, one matrix product per block of rows."""
+        if matrix is None:
+            return [[] for _ in queries]
+        
+        kept_rows = [[] for _ in queries]
+        kept_scores = [[] for _ in queries]
+        for start in range(0, rows, ASSIGN_BLOCK_ROWS):
+            end = min(start + ASSIGN_BLOCK_ROWS, rows)
+            scores = queries @ matrix[start:end].T
+            scores[:, deleted[start:end]] = -np.inf
+            for i, query_scores in enumerate(scores):
+                best = _top_k(query_scores, top_k)
+                kept_rows[i].append(best + start)
+                kept_scores[i].append(query_scores[best])
+        
+        hits = []
+        for candidates, scores in zip(kept_rows, kept_scores):
+            candidates, scores = np.concatenate(candidates), np.concatenate(scores)
+            best = _top_k(scores, top_k)
+            best = best[np.isfinite(scores[best])]
+            hits.append([(int(candidates[i]), float(scores[i])) for i in best])
+        return hits
+    
+    # ---------- Storage ----------
+    
+    def _load(self) -> None:
+        """Map the vectors file and load tombstones and IVF lists."""
+        self._rows = self._db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+        
+        # Drop vectors appended by a write that crashed before its records were committed
+        if self.dim is not None and os.path.exists(self._vectors_path):
+            expected = self._rows * self.dim * 4
+            if os.path.getsize(self._vectors_path) > expected:
+                with open(self._vectors_path, "r+b") as f:
+                    f.truncate(expected)
+        
+        self._deleted = np.zeros(self._rows, dtype=bool)
+        deleted_rows = [r for (r,) in self._db.execute("SELECT row FROM records WHERE deleted = 1")]
+        self._deleted[deleted_rows] = True
+        self._map_vectors()
+        
+        if self.dim is not None:
+            self._quantizer = create_quantizer(self.quantization, self.persist_dir, self.dim)
+            if self._quantizer:
+                self._quantizer.sync(self._rows, self._matrix)
+        
+        self._ivf = None
+        centroids_path = os.path.join(self.persist_dir, IVF_CENTROIDS_FILE)
+        if os.path.exists(centroids_path):
+            self._ivf = {
+                "centroids": np.load(centroids_path),
+                "lists": np.load(os.path.join(self.persist_dir, IVF_LISTS_FILE), mmap_mode="r"),
+                "offsets": np.load(os.path.join(self.persist_dir, IVF_OFFSETS_FILE)),
+                "indexed_rows": self._get_meta("ivf_indexed_rows"),
+                "trained_at": self._get_meta("ivf_trained_at")
+            }
+    
+    def _map_vectors(self) -> None:
+        """(Re)create the read-only memory map over all rows."""
+        if self._quantizer:
+            self._quantizer.remap(self._rows)
+        if self._rows == 0:
+            self._matrix = None
+            return
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.dim))
+    
+    def _tombstone(self, ids: list[str]) -> None:
+        """Mark the live rows of the given IDs as deleted (caller commits)."""
+        for batch in _batches(ids):
+            rows = [r for (r,) in self._db.execute(
+                f"SELECT row FROM records WHERE deleted = 0 AND chunk_id IN ({','.join('?' * len(batch))})", batch
+            )]
+            if rows:
+                self._db.execute(f"UPDATE records SET deleted = 1 WHERE row IN ({','.join('?' * len(rows))})", rows)
+                self._deleted[rows] = True
+    
+    def _fetch_rows(self, rows: set[int]) -> dict[int, dict]:
+        """Load id, content and metadata for the given rows."""
+        records = []
+        with self._lock:
+            for batch in _batches(list(rows)):
+                records += self._db.execute(
+                    f"SELECT row, chunk_id, content, metadata FROM records WHERE row IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+        return {
+            row: {"id": chunk_id, "content": content, "metadata": json.loads(metadata)}
+            for row, chunk_id, content, metadata in records
+        }
+    
+    def _get_meta(self, key: str):
+        """Read an integer value from the meta table."""
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else None
+    
+    def _set_meta(self, key: str, value: int) -> None:
+        """Write an integer value to the meta table."""
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+        self._db.commit()
+    
+    # ---------- IVF ----------
+    
+    def _update_ivf(self) -> None:
+        """Train, extend or keep the IVF index after an insert.
+        
+        Centroids are retrained whenever the live corpus has doubled since
+        the last training. In between, new rows are scanned exactly until
+        they exceed 10% of the indexed rows, then folded into the existing
+        lists without retraining.
+        """
+        live = self.count()
+        if live < self.ivf_threshold:
+            return
+        if self._ivf is None or live >= 2 * self._ivf["trained_at"]:
+            self._train_ivf(live)
+        elif self._rows - self._ivf["indexed_rows"] > 0.1 * self._ivf["indexed_rows"]:
+            centroids, lists, offsets = self._ivf["centroids"], self._ivf["lists"], self._ivf["offsets"]
+            assignment = np.empty(self._ivf["indexed_rows"], dtype=np.int32)
+            assignment[lists] = np.repeat(np.arange(len(centroids)), np.diff(offsets))
+            tail = self._assign(centroids, self._ivf["indexed_rows"], self._rows)
+            self._save_ivf(centroids, np.concatenate([assignment, tail]), self._ivf["trained_at"])
+    
+    def _train_ivf(self, live: int) -> None:
+        """Train sqrt(n) centroids with spherical k-means on a sample of live rows."""
+        rng = np.random.default_rng(0)
+        live_rows = np.flatnonzero(~self._deleted)
+        nlist = max(1, int(np.sqrt(len(live_rows))))
+        sample_rows = np.sort(rng.choice(live_rows, min(len(live_rows), nlist * 32), replace=False))
+        sample = np.asarray(self._matrix[sample_rows])
+        
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(10):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            filled = np.bincount(assignment, minlength=nlist) > 0
+            centroids[filled] = _normalize(sums[filled])
+        
+        self._save_ivf(centroids, self._assign(centroids, 0, self._rows), live)
+    
+    def _assign(self, centroids: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Assign rows [start, end) to their nearest centroid."""
+        assignment = np.empty(end - start, dtype=np.int32)
+        for block in range(start, end, ASSIGN_BLOCK_ROWS):
+            block_end = min(block + ASSIGN_BLOCK_ROWS, end)
+            scores = np.asarray(self._matrix[block:block_end]) @ centroids.T
+            assignment[block - start:block_end - start] = np.argmax(scores, axis=1)
+        return assignment
+    
+    def _save_ivf(self, centroids: np.ndarray, assignment: np.ndarray, trained_at: int) -> None:
+        """Persist centroids and inverted lists (rows grouped by list) atomically."""
+        lists = np.argsort(assignment, kind="stable").astype(np.int64)
+        offsets = np.searchsorted(assignment[lists], np.arange(len(centroids) + 1)).astype(np.int64)
+        for name, array in ((IVF_CENTROIDS_FILE, centroids), (IVF_LISTS_FILE, lists), (IVF_OFFSETS_FILE, offsets)):
+            path = os.path.join(self.persist_dir, name)
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(path + ".tmp", path)
+        self._set_meta("ivf_indexed_rows", len(assignment))
+        self._set_meta("ivf_trained_at", trained_at)
+        self._ivf = {
+            "centroids": centroids,
+            "lists": lists,
+            "offsets": offsets,
+            "indexed_rows": len(assignment),
+            "trained_at": trained_at
+        }
+    
+    def _ivf_candidates(self, ivf: dict, query: np.ndarray, rows: int) -> np.ndarray:
+        """Rows in the nprobe closest lists plus rows not yet indexed, sorted."""
+        probe = _top_k(ivf["centroids"] @ query, self.nprobe)
+        offsets = ivf["offsets"]
+        candidates = np.concatenate(
+            [ivf["lists"][offsets[l]:offsets[l + 1]] for l in probe]
+            + [np.arange(ivf["indexed_rows"], rows)]
+        )
+        candidates.sort()
+        return candidates
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, via argpartition."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    best = np.argpartition(-scores, k - 1)[:k]
+    return best[np.argsort(-scores[best])]
+
+
+def _batches(items: list, size: int = SQL_BATCH):
+    """Yield consecutive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
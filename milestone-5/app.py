@@ -5,6 +5,10 @@ This module initializes the FastAPI app and registers all routes.
 from Config import settings
 from fastapi import FastAPI
 from Database import init_db
+from Services.model_registry import ModelRegistry
+from Services.retrieval_service import RetrievalService
+from Services.index_worker import IndexWorker
+from Services.summary_worker import SummaryWorker
 from Routes import (
     index_router,
     retrieval_router,
@@ -12,6 +16,7 @@ from Routes import (
     chat_router,
     user_router,
     history_router,
+    stats_router,
 )
 
 app = FastAPI(title="RAG Chat API", version="1.0.0")
@@ -23,12 +28,27 @@ app.include_router(ask_router, tags=["Ask"], prefix="/api/v1")
 app.include_router(chat_router, tags=["Chat"], prefix="/api/v1")
 app.include_router(user_router, tags=["Users"], prefix="/api/v1")
 app.include_router(history_router, tags=["History"], prefix="/api/v1")
+app.include_router(stats_router, tags=["Stats"], prefix="/api/v1")
 
 
 @app.on_event("startup")
 def startup():
-    """Initialize database tables on startup."""
+    """Initialize database tables, shared models and the background workers on startup."""
     init_db()
+    app.state.registry = ModelRegistry()
+    RetrievalService(app.state.registry).load_store()
+    app.state.index_worker = IndexWorker(app.state.registry)
+    app.state.index_worker.start()
+    app.state.summary_worker = SummaryWorker(app.state.registry)
+    app.state.summary_worker.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    """Stop the background workers and release shared models on shutdown."""
+    app.state.index_worker.stop()
+    app.state.summary_worker.stop()
+    app.state.registry.close()
 
 
 @app.get("/")
@@ -0,0 +1,51 @@
+"""Long-term memory backfill command-line entry point.
+
+This module embeds messages that were summarized before long-term memory
+existed, so they can be recalled like messages summarized since. The
+per-session recall indexes pick the new embeddings up on the next recall.
+Run it once after upgrading; a re-run only embeds what is still missing.
+
+Usage:
+    python backfill_memory.py
+    python backfill_memory.py --batch-size 512
+"""
+
+import argparse
+from Database import SessionLocal
+from Repositories import MessageEmbeddingRepository
+from Services.memory_service import MemoryService
+from Services.model_registry import ModelRegistry
+
+
+def main() -> None:
+    """Parse arguments and run the backfill."""
+    parser = argparse.ArgumentParser(description="Embed summarized messages that have no memory embedding.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Messages embedded per batch (default: 256)")
+    args = parser.parse_args()
+    
+    registry = ModelRegistry()
+    db = SessionLocal()
+    try:
+        memory_service = MemoryService(db, registry)
+        embedding_repo = MessageEmbeddingRepository(db)
+        total = 0
+        while True:
+            messages = embedding_repo.get_unembedded(memory_service.embed_model, args.batch_size)
+            if not messages:
+                break
+            by_session = {}
+            for msg in messages:
+                by_session.setdefault(msg.session_id, []).append(msg)
+            for session_id, session_messages in by_session.items():
+                memory_service.remember(session_id, session_messages, commit=False)
+            db.commit()
+            total += len(messages)
+            print(f"Progress: {total} messages embedded", flush=True)
+    finally:
+        db.close()
+        registry.close()
+    print(f"Done: {total} messages embedded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Bulk indexing command-line entry point.
+
+This module indexes every document in a directory or zip archive offline
+through IndexService, batching embeddings across files. Completed files are
+appended to a resume manifest so an interrupted run picks up where it
+stopped. With --rebuild the corpus is indexed into a new index generation
+that is activated only once it is complete, so the API keeps serving the
+previous generation meanwhile. A generation with failed files is left
+inactive unless --activate-partial is given. The exit status is 1 if any
+file failed.
+
+Usage:
+    python bulk_index.py docs/
+    python bulk_index.py corpus.zip --manifest corpus.done.jsonl
+    python bulk_index.py docs/ --rebuild
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from typing import Callable, Iterator
+from Services.model_registry import ModelRegistry
+from Services.index_service import IndexService
+from VectorStores import generation_dir, create_generation, activate_generation, prune_generations
+from Config import settings
+
+DEFAULT_EXTENSIONS = ".pdf,.txt,.md"
+
+# Seconds between progress lines
+REPORT_INTERVAL = 5
+
+
+def iter_directory(root: str, extensions: set[str]) -> Iterator[tuple[str, str, str, Callable]]:
+    """Walk a directory for files to index.
+    
+    Args:
+        root: Directory to walk.
+        extensions: Lowercase file extensions to include.
+    
+    Yields:
+        (source, filename, fingerprint, open) tuples; the source is the path
+        relative to root and the fingerprint is size and modification time.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() not in extensions:
+                continue
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            source = os.path.relpath(path, root).replace(os.sep, "/")
+            yield source, filename, f"{stat.st_size}:{stat.st_mtime_ns}", lambda path=path: open(path, "rb")
+
+
+def iter_archive(archive: zipfile.ZipFile, extensions: set[str]) -> Iterator[tuple[str, str, str, Callable]]:
+    """List zip archive members to index.
+    
+    Args:
+        archive: Open zip archive.
+        extensions: Lowercase file extensions to include.
+    
+    Yields:
+        (source, filename, fingerprint, open) tuples; the source is the member
+        name and the fingerprint is size and CRC.
+    """
+    for info in sorted(archive.infolist(), key=lambda i: i.filename):
+        if info.is_dir() or os.path.splitext(info.filename)[1].lower() not in extensions:
+            continue
+        filename = os.path.basename(info.filename)
+        yield info.filename, filename, f"{info.file_size}:{info.CRC}", lambda info=info: archive.open(info)
+
+
+def load_completed(manifest_path: str) -> dict[str, str]:
+    """Read the resume manifest.
+    
+    Args:
+        manifest_path: JSON-lines file of completed files.
+    
+    Returns:
+        Dict of source to fingerprint for files already indexed.
+    """
+    completed = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    completed[entry["source"]] = entry["fingerprint"]
+    return completed
+
+
+def main() -> None:
+    """Parse arguments and run the bulk index."""
+    parser = argparse.ArgumentParser(description="Index a directory or zip archive of documents.")
+    parser.add_argument("path", help="Directory or .zip archive to index")
+    parser.add_argument("--manifest", help="Resume manifest (default: <path>[.<generation>].indexed.jsonl)")
+    parser.add_argument("--ext", default=DEFAULT_EXTENSIONS, help=f"Extensions to index (default: {DEFAULT_EXTENSIONS})")
+    parser.add_argument("--storage-dir", help="Index storage directory (default: IndexService's)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Index into a new generation and activate it when done")
+    parser.add_argument("--generation", help="Continue an interrupted --rebuild of this generation")
+    parser.add_argument("--activate-partial", action="store_true",
+                        help="Activate the rebuilt generation even if some files failed")
+    parser.add_argument("--processes", type=int, default=settings.EMBED_PROCESSES,
+                        help="Embedding worker processes, 0 for in-process (default: EMBED_PROCESSES)")
+    parser.add_argument("--batch-size", type=int, default=settings.EMBED_BATCH_SIZE,
+                        help="Texts per embedding call (default: EMBED_BATCH_SIZE)")
+    parser.add_argument("--threads", type=int, default=settings.EMBED_THREADS_PER_PROCESS,
+                        help="Torch threads per embedding process (default: EMBED_THREADS_PER_PROCESS)")
+    parser.add_argument("--no-sort-by-length", action="store_true",
+                        help="Embed chunks in arrival order instead of grouping similar lengths")
+    args = parser.parse_args()
+    
+    settings.EMBED_PROCESSES = args.processes
+    settings.EMBED_BATCH_SIZE = args.batch_size
+    settings.EMBED_THREADS_PER_PROCESS = args.threads
+    settings.EMBED_SORT_BY_LENGTH = not args.no_sort_by_length
+    
+    service = IndexService(ModelRegistry())
+    if args.storage_dir:
+        service.storage_dir = args.storage_dir
+    if args.generation:
+        if not os.path.isdir(generation_dir(service.storage_dir, args.generation)):
+            parser.error(f"index generation not found: {args.generation}")
+        service.generation = args.generation
+    elif args.rebuild:
+        service.generation = create_generation(service.storage_dir)
+        print(f"Building index generation {service.generation}", flush=True)
+    
+    extensions = {e.strip().lower() for e in args.ext.split(",") if e.strip()}
+    # A rebuild resumes per generation, since the new generation starts empty
+    suffix = f".{service.generation}.indexed.jsonl" if service.generation else ".indexed.jsonl"
+    manifest_path = args.manifest or args.path.rstrip("/\\") + suffix
+    completed = load_completed(manifest_path)
+    
+    stats = {"done": 0, "skipped": 0, "chunks": 0}
+    started = last_report = time.monotonic()
+    fingerprints = {}
+    
+    def report(final: bool = False) -> None:
+        elapsed = max(time.monotonic() - started, 1e-9)
+        print(
+            f"{'Done' if final else 'Progress'}: {stats['done']} files ({stats['skipped']} skipped), "
+            f"{stats['chunks']} chunks in {elapsed:.1f}s - "
+            f"{stats['done'] / elapsed:.2f} files/s, {stats['chunks'] / elapsed:.1f} chunks/s",
+            flush=True
+        )
+    
+    def pending(files: Iterator[tuple[str, str, str, Callable]]) -> Iterator[tuple[str, str, Callable]]:
+        for source, filename, fingerprint, open_file in files:
+            if completed.get(source) == fingerprint:
+                stats["skipped"] += 1
+                continue
+            fingerprints[source] = fingerprint
+            yield source, filename, open_file
+    
+    with open(manifest_path, "a", encoding="utf-8") as manifest:
+        def on_complete(source: str, result: dict) -> None:
+            nonlocal last_report
+            manifest.write(json.dumps({"source": source, "fingerprint": fingerprints.pop(source), **result}) + "\n")
+            manifest.flush()
+            stats["done"] += 1
+            stats["chunks"] += result["chunks"]
+            if time.monotonic() - last_report >= REPORT_INTERVAL:
+                last_report = time.monotonic()
+                report()
+        
+        def on_error(source: str, error: Exception) -> None:
+            fingerprints.pop(source, None)
+            print(f"Failed: {source}: {error}", flush=True)
+        
+        if zipfile.is_zipfile(args.path):
+            with zipfile.ZipFile(args.path) as archive:
+                totals = service.index_files(pending(iter_archive(archive, extensions)), on_complete, on_error)
+        else:
+            totals = service.index_files(pending(iter_directory(args.path, extensions)), on_complete, on_error)
+    
+    if service.generation and totals["failed"] and not args.activate_partial:
+        print(
+            f"Not activating index generation {service.generation}: {totals['failed']} files failed. "
+            f"Fix them and rerun with --generation {service.generation}, or pass --activate-partial"
+        )
+    elif service.generation:
+        activate_generation(service.storage_dir, service.generation)
+        pruned = prune_generations(service.storage_dir, settings.INDEX_GENERATIONS_KEEP)
+        print(f"Activated index generation {service.generation}" + (f", pruned {', '.join(pruned)}" if pruned else ""))
+    
+    embedding = service.embeddings.stats()
+    cache = service.registry.get_embedding_cache()
+    cache_stats = cache.stats() if cache else None
+    service.registry.close()
+    report(final=True)
+    print(
+        f"Embedded {totals['embedded']} new chunks, linked {totals['deduplicated']} near-duplicates, "
+        f"removed {totals['removed']} stale chunks, {totals['failed']} files failed"
+    )
+    print(
+        f"Embedding: {embedding['embedded']} texts in {embedding['seconds']:.1f}s - "
+        f"{embedding['embeddings_per_second']:.1f} embeddings/s "
+        f"({embedding['processes']} processes, batch size {embedding['batch_size']})"
+    )
+    if cache_stats:
+        print(
+            f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%}), {cache_stats['size_bytes'] / 2**20:.1f} MB"
+        )
+    if totals["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()